@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+crypto_fill_bench.py – Compare les deux sources de remplissage de l'effacement
+cryptographique sur un périphérique loop.
+
+Mesure le débit de `dd if=/dev/urandom` puis de `dd if=/dev/zero` vers un
+mappage dm-crypt (aes-xts-plain64, clé aléatoire jetable), c'est-à-dire
+l'étape de remplissage de disk_erase.erase_disk_crypto avant et après le
+passage à une source de zéros. Les options de dd sont celles de la
+production.
+
+Usage (root, cryptsetup et losetup requis) :
+    sudo python3 bench/crypto_fill_bench.py --size 2G
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+MAPPER_NAME = f"bench_fill_{os.getpid()}"
+SOURCES = ("/dev/urandom", "/dev/zero")
+
+
+def _parse_size(text: str) -> int:
+    """Convertit '512M', '2G'… en octets."""
+    m = re.fullmatch(r"(\d+)([KMG]?)", text.strip().upper())
+    if not m:
+        raise argparse.ArgumentTypeError(f"Taille invalide : {text}")
+    return int(m.group(1)) * {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}[m.group(2)]
+
+
+def _run(cmd: list) -> str:
+    return subprocess.run(cmd, check=True, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE).stdout.decode().strip()
+
+
+def _fill(source: str, target: str) -> float:
+    """Remplit `target` depuis `source` et retourne le débit en Mo/s."""
+    start = time.monotonic()
+    # Mêmes options que le remplissage de production (écriture bufferisée)
+    subprocess.run(["dd", f"if={source}", f"of={target}", "bs=4M", "status=progress"],
+                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    elapsed = time.monotonic() - start
+    size = int(_run(["blockdev", "--getsize64", target]))
+    return size / elapsed / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark du remplissage cryptographique")
+    parser.add_argument("--size", type=_parse_size, default=_parse_size("1G"),
+                        help="Taille de l'image loop (défaut : 1G)")
+    parser.add_argument("--runs", type=int, default=3, help="Nombre de mesures par source")
+    args = parser.parse_args()
+
+    if os.geteuid() != 0:
+        print("Ce benchmark doit être exécuté en tant que root.", file=sys.stderr)
+        sys.exit(1)
+
+    workdir = tempfile.mkdtemp(prefix="crypto_fill_bench_")
+    image = os.path.join(workdir, "disk.img")
+    keyfile = os.path.join(workdir, "key")
+    loop = None
+    opened = False
+    try:
+        with open(image, "wb") as f:
+            f.truncate(args.size)
+        with open(keyfile, "wb") as f:
+            f.write(os.urandom(64))
+        loop = _run(["losetup", "--find", "--show", image])
+        _run(["cryptsetup", "open", "--type", "plain", "--cipher", "aes-xts-plain64",
+              "--key-size", "512", "--key-file", keyfile, loop, MAPPER_NAME])
+        opened = True
+
+        target = f"/dev/mapper/{MAPPER_NAME}"
+        results = {}
+        for source in SOURCES:
+            results[source] = [_fill(source, target) for _ in range(args.runs)]
+
+        print(f"Image : {args.size / (1 << 20):.0f} Mio sur {loop}, {args.runs} mesure(s)")
+        for source, rates in results.items():
+            print(f"  {source:<13} {max(rates):8.1f} Mo/s (meilleure)  {sum(rates) / len(rates):8.1f} Mo/s (moyenne)")
+        gain = max(results["/dev/zero"]) / max(max(results["/dev/urandom"]), 1e-9)
+        print(f"  Gain de la source zéro : x{gain:.2f}")
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"Échec du benchmark : {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if opened:
+            subprocess.run(["cryptsetup", "close", MAPPER_NAME], check=False)
+        if loop:
+            subprocess.run(["losetup", "-d", loop], check=False)
+        for path in (keyfile, image):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        try:
+            os.rmdir(workdir)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
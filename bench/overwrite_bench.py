@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+overwrite_bench.py – Compare l'écrasement aléatoire d'io_engine à shred sur
+un périphérique loop.
+
+Mesure le débit de `shred -n <passes> -v` (l'ancien erase_disk_hdd) puis de
+io_engine.overwrite_device(["random"] * passes), flux aléatoire non
+répétitif compris, sur la même image. Le débit de génération seule du flux
+(io_engine.STREAM_VERSION, sans écriture) est aussi affiché : c'est le
+plafond du moteur quand le disque est plus rapide que le processeur.
+
+Usage (root et losetup requis) :
+    sudo python3 bench/overwrite_bench.py --size 2G
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+
+from io_engine import SEED_SIZE, STREAM_BLOCK, STREAM_VERSION, overwrite_device, stream_bytes  # noqa: E402
+
+
+def _parse_size(text: str) -> int:
+    """Convertit '512M', '2G'… en octets."""
+    m = re.fullmatch(r"(\d+)([KMG]?)", text.strip().upper())
+    if not m:
+        raise argparse.ArgumentTypeError(f"Taille invalide : {text}")
+    return int(m.group(1)) * {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}[m.group(2)]
+
+
+def _run(cmd: list) -> str:
+    return subprocess.run(cmd, check=True, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE).stdout.decode().strip()
+
+
+def _shred(target: str, size: int, passes: int) -> float:
+    """Écrase `target` avec shred et retourne le débit en Mo/s."""
+    start = time.monotonic()
+    _run(["shred", "-n", str(passes), "-v", target])
+    return size * passes / (time.monotonic() - start) / 1e6
+
+
+def _engine(target: str, size: int, passes: int) -> float:
+    """Écrase `target` avec io_engine et retourne le débit en Mo/s."""
+    start = time.monotonic()
+    overwrite_device(target, ["random"] * passes)
+    return size * passes / (time.monotonic() - start) / 1e6
+
+
+def _stream(size: int) -> float:
+    """Débit de génération du flux aléatoire seul, en Mo/s."""
+    seed = os.urandom(SEED_SIZE)
+    start = time.monotonic()
+    for offset in range(0, size, 16 * STREAM_BLOCK):
+        stream_bytes(seed, offset, min(16 * STREAM_BLOCK, size - offset))
+    return size / (time.monotonic() - start) / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark écrasement io_engine contre shred")
+    parser.add_argument("--size", type=_parse_size, default=_parse_size("1G"),
+                        help="Taille de l'image loop (défaut : 1G)")
+    parser.add_argument("--passes", type=int, default=1, help="Passages aléatoires (défaut : 1)")
+    parser.add_argument("--runs", type=int, default=3, help="Nombre de mesures par outil")
+    args = parser.parse_args()
+
+    if os.geteuid() != 0:
+        print("Ce benchmark doit être exécuté en tant que root.", file=sys.stderr)
+        sys.exit(1)
+
+    workdir = tempfile.mkdtemp(prefix="overwrite_bench_")
+    image = os.path.join(workdir, "disk.img")
+    loop = None
+    try:
+        with open(image, "wb") as f:
+            f.truncate(args.size)
+        loop = _run(["losetup", "--find", "--show", "--direct-io=on", image])
+
+        results = {"shred": [], "io_engine": []}
+        for _ in range(args.runs):
+            results["shred"].append(_shred(loop, args.size, args.passes))
+            results["io_engine"].append(_engine(loop, args.size, args.passes))
+
+        print(f"Image : {args.size / (1 << 20):.0f} Mio sur {loop}, {args.passes} passage(s), "
+              f"{args.runs} mesure(s)")
+        for tool, rates in results.items():
+            print(f"  {tool:<10} {max(rates):8.1f} Mo/s (meilleure)  {sum(rates) / len(rates):8.1f} Mo/s (moyenne)")
+        print(f"  flux seul  {_stream(args.size):8.1f} Mo/s (génération {STREAM_VERSION}, sans écriture)")
+        gain = max(results["io_engine"]) / max(max(results["shred"]), 1e-9)
+        print(f"  io_engine / shred : x{gain:.2f}")
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"Échec du benchmark : {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if loop:
+            subprocess.run(["losetup", "-d", loop], check=False)
+        try:
+            os.remove(image)
+        except OSError:
+            pass
+        try:
+            os.rmdir(workdir)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
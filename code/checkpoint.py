@@ -0,0 +1,94 @@
+"""
+checkpoint.py – Journal de reprise des effacements par écrasement.
+Un fichier JSON par disque dans /var/lib/disk_eraser/checkpoints, nommé
+d'après l'identifiant stable du disque (get_disk_serial).
+
+Le journal enregistre le passage en cours, les graines des motifs et
+l'offset atteint par chaque bande ; io_engine l'alimente tous les
+CHECKPOINT_BYTES écrits, après un fsync du périphérique. Chaque écriture
+du journal est atomique (fichier temporaire, fsync, rename, fsync du
+répertoire) pour survivre à une coupure de courant.
+"""
+import json
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+CHECKPOINT_DIR = "/var/lib/disk_eraser/checkpoints"
+
+logger = logging.getLogger(__name__)
+
+
+def _path(disk_id: str) -> str:
+    """Chemin du journal d'un disque (identifiant réduit aux caractères sûrs)."""
+    return os.path.join(CHECKPOINT_DIR, re.sub(r"[^A-Za-z0-9._-]", "_", disk_id) + ".json")
+
+
+def load_checkpoint(disk_id: str) -> Optional[dict]:
+    """Retourne le journal du disque, ou None s'il n'existe pas ou est illisible."""
+    path = _path(disk_id)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("disk_id") != disk_id or "state" not in data:
+            return None
+        return data
+    except (json.JSONDecodeError, OSError) as e:
+        logger.error(f"Erreur lecture point de reprise {path}: {e}")
+        return None
+
+
+def save_checkpoint(disk_id: str, device: str, method: str, state: dict) -> None:
+    """Enregistre durablement l'état d'écriture du disque."""
+    os.makedirs(CHECKPOINT_DIR, mode=0o700, exist_ok=True)
+    path = _path(disk_id)
+    tmp = path + ".tmp"
+    data = {
+        "disk_id": disk_id,
+        "device":  device,
+        "method":  method,
+        "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "state":   state,
+    }
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        dir_fd = os.open(CHECKPOINT_DIR, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError as e:
+        logger.error(f"Erreur écriture point de reprise {path}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def clear_checkpoint(disk_id: str) -> None:
+    """Supprime le journal d'un disque (effacement terminé ou abandonné)."""
+    try:
+        os.remove(_path(disk_id))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"Erreur suppression point de reprise de {disk_id}: {e}")
+
+
+def describe_checkpoint(data: dict) -> str:
+    """Résumé lisible : passage et pourcentage atteints."""
+    state = data["state"]
+    if state["pass_index"] > state["pass_count"]:
+        return f"écriture terminée (enregistré le {data.get('updated', '?')})"
+    size = state.get("size") or 1
+    done = sum(offset - start for start, _, offset in state.get("stripes", []))
+    return (f"passe {state['pass_index']}/{state['pass_count']}, {100 * done / size:.0f} % "
+            f"(enregistré le {data.get('updated', '?')})")
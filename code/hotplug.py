@@ -0,0 +1,196 @@
+"""
+hotplug.py – Surveillance des branchements de disques par uevent netlink.
+
+Un thread écoute la socket NETLINK_KOBJECT_UEVENT (bibliothèque standard,
+aucun sous-processus) et transmet chaque événement du sous-système block
+(add, remove, change…) sous forme d'UEvent. Deux groupes multicast sont
+suivis :
+
+  - 1 : messages du noyau, reçus dès l'apparition du périphérique ;
+  - 2 : messages d'udevd, émis une fois les règles appliquées (nœud /dev,
+        base udev, identifiants complets).
+
+Un disque inséré est donc signalé en quelques millisecondes, puis une
+seconde fois quand udev a terminé. Au repos, le thread est bloqué dans
+select() : aucun inventaire n'est relancé.
+
+Chaque événement invalide l'entrée du disque dans device_cache avant
+d'être transmis au rappel.
+"""
+import logging
+import os
+import select
+import socket
+import struct
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from device_cache import device_cache
+
+NETLINK_KOBJECT_UEVENT = 15           # linux/netlink.h (absent du module socket)
+UEVENT_GROUPS = 0x1 | 0x2             # noyau | udevd
+UEVENT_BUFFER = 64 * 1024             # taille maximale d'un message
+SOCKET_RCVBUF = 1024 * 1024           # absorbe les rafales (baie de 60 disques)
+UDEV_PREFIX = b"libudev\0"
+OVERFLOW = "overflow"                 # action synthétique : événements perdus, tout relire
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UEvent:
+    """Événement d'un périphérique bloc (disque ou partition)."""
+    action: str                 # add, remove, change, online, offline…
+    devname: str                # sda, sda1, nvme0n1p2…
+    devtype: str                # disk, partition
+    devpath: str                # chemin sysfs relatif (/devices/…)
+    source: str                 # "kernel" ou "udev"
+    properties: dict = field(default_factory=dict, compare=False)
+
+    @property
+    def disk(self) -> str:
+        """Disque concerné : le parent sysfs pour une partition."""
+        if self.devtype == "partition":
+            parts = self.devpath.rstrip("/").split("/")
+            if len(parts) >= 2:
+                return parts[-2]
+        return self.devname
+
+
+def parse_uevent(data: bytes) -> Optional[UEvent]:
+    """
+    Décode un message uevent (noyau : « action@devpath\\0CLÉ=valeur\\0… » ;
+    udevd : en-tête libudev puis CLÉ=valeur\\0…). None si le message ne
+    concerne pas un périphérique bloc ou est mal formé.
+    """
+    source = "kernel"
+    if data.startswith(UDEV_PREFIX):
+        if len(data) < 24:
+            return None
+        # struct udev_monitor_netlink_header : préfixe, magic, taille d'en-tête,
+        # offset et longueur des propriétés (ordre de l'hôte)
+        offset, length = struct.unpack_from("=II", data, 16)
+        data = data[offset:offset + length]
+        source = "udev"
+
+    properties = {}
+    for item in data.split(b"\0"):
+        key, sep, value = item.partition(b"=")
+        if sep:
+            properties[key.decode("ascii", errors="replace")] = value.decode("utf-8", errors="replace")
+
+    if properties.get("SUBSYSTEM") != "block" or not properties.get("DEVNAME"):
+        return None
+    return UEvent(
+        action=properties.get("ACTION", ""),
+        devname=os.path.basename(properties["DEVNAME"]),
+        devtype=properties.get("DEVTYPE", ""),
+        devpath=properties.get("DEVPATH", ""),
+        source=source,
+        properties=properties,
+    )
+
+
+class HotplugMonitor:
+    """
+    Thread d'écoute des uevents bloc. `callback(event)` est appelé depuis
+    ce thread : l'interface graphique doit repasser par root.after.
+
+        monitor = HotplugMonitor(on_event)
+        if not monitor.start():
+            ...  # netlink indisponible : revenir à la scrutation périodique
+    """
+
+    def __init__(self, callback: Callable[[UEvent], None]) -> None:
+        self.callback = callback
+        self._sock = None
+        self._wake_r = self._wake_w = None
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Ouvre la socket netlink et lance le thread. False si c'est impossible."""
+        if self.running:
+            return True
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Surveillance hotplug indisponible : {e}")
+            return False
+        try:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+            except OSError:
+                pass
+            sock.bind((0, UEVENT_GROUPS))
+        except OSError as e:
+            sock.close()
+            logger.warning(f"Surveillance hotplug indisponible : {e}")
+            return False
+
+        self._sock = sock
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="hotplug-monitor", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Arrête le thread et ferme la socket."""
+        if self._thread is None:
+            return
+        os.write(self._wake_w, b"\0")
+        self._thread.join(timeout=2)
+        self._thread = None
+        for fd in (self._wake_r, self._wake_w):
+            os.close(fd)
+        self._wake_r = self._wake_w = None
+        self._sock.close()
+        self._sock = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                ready, _, _ = select.select([self._sock, self._wake_r], [], [])
+            except OSError:
+                return
+            if self._wake_r in ready:
+                return
+            try:
+                data, (sender, _) = self._sock.recvfrom(UEVENT_BUFFER)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                # ENOBUFS : rafale plus grosse que le tampon, des événements
+                # ont été perdus ; tout le cache devient suspect
+                logger.warning(f"Événements hotplug perdus : {e}")
+                device_cache.invalidate()
+                event = UEvent(action=OVERFLOW, devname="", devtype="", devpath="", source="kernel")
+                self._dispatch(event)
+                continue
+
+            event = parse_uevent(data)
+            if event is None:
+                continue
+            # Les messages du noyau ont l'adresse 0 ; rejeter les imitations
+            if event.source == "kernel" and sender != 0:
+                continue
+            device_cache.invalidate(event.disk)
+            self._dispatch(event)
+
+    def _dispatch(self, event: UEvent) -> None:
+        try:
+            self.callback(event)
+        except Exception as e:
+            logger.error(f"Erreur dans le traitement d'un événement hotplug : {e}")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
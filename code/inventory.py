@@ -0,0 +1,133 @@
+"""
+inventory.py – Inventaire des disques en un seul appel lsblk.
+
+`lsblk --json -O` décrit en une fois tous les périphériques bloc et leur
+arborescence (partitions, volumes LVM, conteneurs LUKS…) ; les attributs
+numériques (taille exacte, support rotatif) sont lus directement dans
+sysfs. Un rafraîchissement coûte ainsi un seul processus, quel que soit
+le nombre de disques.
+
+get_disk_records() conserve le résultat tant qu'aucun périphérique n'a
+changé (voir device_cache.py) : lsblk n'est relancé qu'après un
+branchement, un retrait, un repartitionnement ou un formatage.
+
+Les anciennes versions de lsblk (util-linux < 2.33) rendent toutes les
+valeurs JSON sous forme de chaînes : les champs sont normalisés ici.
+"""
+import json
+import subprocess
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from blkdev import is_rotational, read_sysfs_int
+from device_cache import device_cache
+
+LSBLK_COMMAND = ["lsblk", "--json", "-O"]
+
+
+@dataclass(frozen=True)
+class DiskRecord:
+    """Disque de premier niveau tel que vu par lsblk et sysfs."""
+    name: str                       # sda, nvme0n1…
+    size: str                       # taille lisible lsblk (465,8G)
+    size_bytes: int
+    model: str
+    label: str                      # premier libellé du disque ou de ses descendants
+    filesystem: str
+    partition_table: str            # GPT, MBR, Aucune…
+    rotational: bool
+    transport: str                  # sata, usb, nvme… (chaîne vide si inconnu)
+    descendants: Tuple[str, ...]    # noms lsblk des partitions, volumes, mappages…
+
+    @property
+    def device(self) -> str:
+        return f"/dev/{self.name}"
+
+    def as_dict(self) -> dict:
+        """Représentation historique de utils.get_disk_list."""
+        return {
+            "device": self.device,
+            "size": self.size,
+            "model": self.model,
+            "label": self.label,
+            "filesystem": self.filesystem,
+            "partition_table": self.partition_table,
+            "rotational": self.rotational,
+            "size_bytes": self.size_bytes,
+            "transport": self.transport,
+        }
+
+
+def _text(value) -> str:
+    """Champ lsblk en chaîne (None et null JSON -> chaîne vide)."""
+    return "" if value is None else str(value).strip()
+
+
+def _walk(node: dict):
+    """Parcours préfixe : le disque puis ses descendants, dans l'ordre de lsblk."""
+    yield node
+    for child in node.get("children") or []:
+        yield from _walk(child)
+
+
+def _first(nodes: list, key: str) -> str:
+    """Première valeur non vide d'un champ dans l'arborescence (comme `lsblk -o X -n`)."""
+    for node in nodes:
+        value = _text(node.get(key))
+        if value:
+            return value
+    return ""
+
+
+def _partition_table_name(pttype: str) -> str:
+    pttype = pttype.lower()
+    if not pttype:
+        return "Aucune"
+    if pttype == "gpt":
+        return "GPT"
+    if pttype in ("dos", "msdos", "mbr"):
+        return "MBR"
+    return pttype.upper()
+
+
+def _record(node: dict) -> DiskRecord:
+    name = _text(node.get("name"))
+    nodes = list(_walk(node))
+    return DiskRecord(
+        name=name,
+        size=_text(node.get("size")),
+        size_bytes=read_sysfs_int(name, "size") * 512,
+        model=_text(node.get("model")) or "Unknown",
+        label=_first(nodes, "label") or "No Label",
+        filesystem=_first(nodes, "fstype") or "—",
+        partition_table=_partition_table_name(_first(nodes, "pttype")),
+        rotational=is_rotational(name),
+        transport=_text(node.get("tran")),
+        descendants=tuple(_text(n.get("name")) for n in nodes[1:]),
+    )
+
+
+def parse_lsblk_json(output: str) -> List[DiskRecord]:
+    """Construit les DiskRecord à partir de la sortie de `lsblk --json -O`."""
+    data = json.loads(output) if output.strip() else {}
+    return [_record(node) for node in data.get("blockdevices", []) if node.get("name")]
+
+
+def scan_disks() -> List[DiskRecord]:
+    """
+    Inventaire complet des disques (un seul processus lsblk).
+    Lève FileNotFoundError si lsblk est absent, CalledProcessError s'il
+    échoue et ValueError si sa sortie n'est pas du JSON valide.
+    """
+    output = subprocess.run(
+        LSBLK_COMMAND,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ).stdout.decode("utf-8", errors="replace")
+    return parse_lsblk_json(output)
+
+
+def get_disk_records() -> List[DiskRecord]:
+    """Inventaire mis en cache, relu seulement si un périphérique a changé."""
+    return list(device_cache.get(None, "records", scan_disks))
@@ -0,0 +1,134 @@
+"""
+inventory_worker.py – Collecte de l'inventaire des disques hors du thread Tk.
+
+Un thread dédié construit, à chaque demande, un instantané immuable de
+l'inventaire (disques, identifiants, disques système) puis le compare au
+précédent. Seul le résultat (disques ajoutés, retirés, modifiés) est
+transmis à l'interface, qui l'applique sur sa boucle principale : aucun
+appel bloquant (lsblk, sysfs d'un boîtier USB lent…) n'est fait sur le
+thread Tk.
+
+request() peut être appelé depuis n'importe quel thread ; les demandes
+reçues pendant une collecte sont regroupées en une seule collecte suivante.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from disk_erase import get_disk_serial
+from disk_operations import get_active_disk
+from utils import get_base_disk, get_disk_list
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InventorySnapshot:
+    """État de l'inventaire à un instant donné (en lecture seule)."""
+    disks: Tuple[Mapping[str, object], ...]     # champs de get_disk_list + disk_id, active
+    active: FrozenSet[str]                      # disques système (noms de base)
+    errors: Tuple[str, ...] = ()
+
+    def by_device(self) -> Dict[str, Mapping[str, object]]:
+        return {disk["device"]: disk for disk in self.disks}
+
+
+@dataclass(frozen=True)
+class InventoryDelta:
+    """Différences entre deux instantanés, par chemin de périphérique."""
+    added: Tuple[str, ...]
+    removed: Tuple[str, ...]
+    updated: Tuple[str, ...]
+    active_changed: bool
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.updated or self.active_changed)
+
+
+def collect_snapshot() -> InventorySnapshot:
+    """Inventaire complet (appels bloquants : à exécuter hors du thread Tk)."""
+    errors = []
+    disks = get_disk_list()
+
+    try:
+        active = frozenset(get_active_disk() or ())
+    except Exception as e:
+        errors.append(f"Erreur lors de la détection du disque actif : {str(e)}")
+        active = frozenset()
+
+    entries = []
+    for disk in disks:
+        device_name = disk["device"].replace("/dev/", "")
+        try:
+            disk_id = get_disk_serial(device_name)
+        except Exception:
+            disk_id = device_name
+        try:
+            is_active = get_base_disk(device_name) in active
+        except Exception:
+            is_active = False
+        entries.append(MappingProxyType(dict(disk, disk_id=disk_id, active=is_active)))
+    return InventorySnapshot(tuple(entries), active, tuple(errors))
+
+
+def diff_snapshots(old: Optional[InventorySnapshot], new: InventorySnapshot) -> InventoryDelta:
+    """Disques ajoutés, retirés et modifiés entre `old` (None : aucun) et `new`."""
+    before = old.by_device() if old else {}
+    after = new.by_device()
+    return InventoryDelta(
+        added=tuple(dev for dev in after if dev not in before),
+        removed=tuple(dev for dev in before if dev not in after),
+        updated=tuple(dev for dev in after if dev in before and dict(before[dev]) != dict(after[dev])),
+        active_changed=old is None or old.active != new.active,
+    )
+
+
+class InventoryWorker:
+    """
+    Thread de collecte. `on_change(snapshot, delta)` est appelé depuis ce
+    thread après chaque collecte : l'interface doit repasser par root.after.
+    """
+
+    def __init__(self, on_change: Callable[[InventorySnapshot, InventoryDelta], None]) -> None:
+        self.on_change = on_change
+        self._wake = threading.Event()
+        self._stopping = False
+        self._snapshot: Optional[InventorySnapshot] = None
+        self._thread = threading.Thread(target=self._run, name="inventory-worker", daemon=True)
+
+    @property
+    def snapshot(self) -> Optional[InventorySnapshot]:
+        """Dernier instantané collecté (None avant la première collecte)."""
+        return self._snapshot
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def request(self) -> None:
+        """Demande une nouvelle collecte (non bloquant, depuis n'importe quel thread)."""
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            if self._stopping:
+                return
+            self._wake.clear()
+            try:
+                snapshot = collect_snapshot()
+            except Exception as e:
+                logger.error(f"Erreur de collecte de l'inventaire : {e}")
+                continue
+            delta = diff_snapshots(self._snapshot, snapshot)
+            self._snapshot = snapshot
+            try:
+                self.on_change(snapshot, delta)
+            except Exception as e:
+                logger.error(f"Erreur de transmission de l'inventaire : {e}")
@@ -5,6 +5,7 @@ import sys
 from argparse import ArgumentParser
 from cli_interface import run_cli_mode
 from gui_interface import run_gui_mode
+from io_engine import SAMPLE_COUNT
 
 def main():
     # Parse command-line arguments
@@ -14,6 +15,9 @@ def main():
     parser.add_argument('-p', '--passes', type=int, default=5, help="Number of passes for erasure")
     parser.add_argument('--crypto', action='store_true', help="Use cryptographic erasure instead of standard multi-pass method")
     parser.add_argument('--zero', action='store_true', help="Fill encrypted disk with zero data instead of random data")
+    parser.add_argument('--offload', action='store_true', help="Use kernel offload erasure (BLKZEROOUT / BLKSECDISCARD) instead of overwriting")
+    parser.add_argument('--verify', choices=['none', 'full', 'sample'], help="Read the disk back after erasure (whole disk or random samples) and compare it with the last pattern written")
+    parser.add_argument('--verify-samples', type=int, default=SAMPLE_COUNT, help=f"Number of random blocks read by --verify sample (default: {SAMPLE_COUNT})")
     args = parser.parse_args()
     
     # Check for root privileges
@@ -0,0 +1,81 @@
+"""
+throughput_history.py – Débits mesurés par modèle de disque.
+Stocké dans /var/lib/disk_eraser/throughput.json.
+
+Chaque effacement terminé met à jour, pour le couple (modèle, méthode), une
+moyenne mobile exponentielle du débit observé ; le planificateur de lot
+(disk_operations.plan_batch) s'en sert pour estimer la durée des prochains
+effacements du même modèle.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+
+HISTORY_DIR  = "/var/lib/disk_eraser"
+HISTORY_FILE = os.path.join(HISTORY_DIR, "throughput.json")
+HISTORY_ALPHA = 0.3     # poids de la dernière mesure
+
+logger = logging.getLogger(__name__)
+
+# Les effacements parallèles mettent l'historique à jour en même temps
+_lock = threading.Lock()
+
+
+def _load() -> dict:
+    """Charge l'historique ou retourne un dictionnaire vide."""
+    if not os.path.isfile(HISTORY_FILE):
+        return {}
+    try:
+        with open(HISTORY_FILE, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        logger.error(f"Erreur lecture historique de débit: {e}")
+        return {}
+
+
+def _save(data: dict) -> None:
+    """Enregistre atomiquement l'historique."""
+    tmp = None
+    try:
+        os.makedirs(HISTORY_DIR, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=HISTORY_DIR, prefix=".throughput.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, HISTORY_FILE)
+    except OSError as e:
+        logger.error(f"Erreur écriture historique de débit: {e}")
+        if tmp:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def _key(model: str, method: str) -> str:
+    return f"{model.strip() or 'inconnu'}|{method}"
+
+
+def get_throughput(model: str, method: str) -> Optional[float]:
+    """Débit historique (octets/s) du modèle pour la méthode, ou None."""
+    with _lock:
+        entry = _load().get(_key(model, method))
+    return entry["rate"] if entry else None
+
+
+def record_throughput(model: str, method: str, rate: float) -> None:
+    """Intègre un débit mesuré (octets/s) à l'historique du modèle."""
+    if rate <= 0:
+        return
+    with _lock:
+        data = _load()
+        key = _key(model, method)
+        entry = data.get(key)
+        if entry:
+            entry["rate"] = HISTORY_ALPHA * rate + (1 - HISTORY_ALPHA) * entry["rate"]
+            entry["samples"] += 1
+        else:
+            data[key] = {"rate": rate, "samples": 1}
+        _save(data)
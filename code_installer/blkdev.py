@@ -0,0 +1,131 @@
+"""
+blkdev.py – Accès direct aux attributs sysfs des périphériques bloc.
+
+Lecture des fichiers /sys/block/<dev>/… sans lancer de sous-processus.
+Toutes les fonctions retournent une valeur par défaut si l'attribut
+n'existe pas (périphérique retiré, noyau ancien, conteneur).
+
+Les propriétés udev (ID_WWN, ID_SERIAL_SHORT…) sont lues dans la base de
+udevd, /run/udev/data/b<majeur>:<mineur>, comme le fait `udevadm info`.
+
+Les ioctl bloc (linux/fs.h) sont émis via fcntl.ioctl sur un descripteur
+déjà ouvert en écriture.
+"""
+import fcntl
+import os
+import struct
+
+SYS_BLOCK = "/sys/block"
+UDEV_DATA = "/run/udev/data"
+
+# ── ioctl bloc (linux/fs.h) ────────────────────────────────────────────────────
+BLKRRPART     = 0x125F    # _IO(0x12, 95)
+BLKDISCARD    = 0x1277    # _IO(0x12, 119)
+BLKSECDISCARD = 0x127D    # _IO(0x12, 125)
+BLKZEROOUT    = 0x127F    # _IO(0x12, 127)
+
+
+def read_sysfs(device: str, attr: str, default: str = "") -> str:
+    """Lit /sys/block/<device>/<attr> et retourne son contenu sans espaces."""
+    device = device.replace("/dev/", "")
+    try:
+        with open(os.path.join(SYS_BLOCK, device, attr), "r") as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return default
+
+
+def read_sysfs_int(device: str, attr: str, default: int = 0) -> int:
+    """Lit un attribut sysfs numérique."""
+    try:
+        return int(read_sysfs(device, attr, str(default)))
+    except ValueError:
+        return default
+
+
+def is_rotational(device: str) -> bool:
+    """True si le noyau signale un support rotatif (HDD)."""
+    return read_sysfs(device, "queue/rotational", "1") != "0"
+
+
+def get_hw_queue_count(device: str) -> int:
+    """Nombre de files matérielles blk-mq (répertoires /sys/block/<dev>/mq/N)."""
+    device = device.replace("/dev/", "")
+    try:
+        return max(1, len(os.listdir(os.path.join(SYS_BLOCK, device, "mq"))))
+    except OSError:
+        return 1
+
+
+def get_nr_requests(device: str) -> int:
+    """Profondeur de la file logicielle du noyau (queue/nr_requests)."""
+    return max(1, read_sysfs_int(device, "queue/nr_requests", 1))
+
+
+def get_model(device: str) -> str:
+    """Modèle annoncé par le périphérique (SCSI/SATA/NVMe), chaîne vide sinon."""
+    return read_sysfs(device, "device/model")
+
+
+def read_udev_properties(device: str) -> dict:
+    """
+    Propriétés udev du périphérique (lignes « E:CLÉ=valeur » de la base
+    udevd). Dictionnaire vide si udevd n'a pas d'entrée pour ce disque.
+    """
+    dev_number = read_sysfs(device, "dev")
+    if not dev_number:
+        return {}
+    properties = {}
+    try:
+        with open(os.path.join(UDEV_DATA, f"b{dev_number}"), "r", errors="replace") as f:
+            for line in f:
+                if line.startswith("E:") and "=" in line:
+                    key, _, value = line[2:].rstrip("\n").partition("=")
+                    properties[key] = value
+    except OSError:
+        return {}
+    return properties
+
+
+def get_sysfs_identity(device: str) -> dict:
+    """
+    Identité exposée directement par le noyau, sans udevd :
+    WWN (NAA, au format 0x… d'ID_WWN), numéro de série et modèle.
+    Les valeurs absentes sont des chaînes vides.
+    """
+    wwid = read_sysfs(device, "device/wwid") or read_sysfs(device, "wwid")
+    wwn = ""
+    if wwid.lower().startswith("naa."):
+        wwn = "0x" + wwid[4:].lower()
+    elif wwid.lower().startswith(("eui.", "nvme.")):
+        wwn = wwid                  # NVMe : udev reprend l'attribut tel quel
+    serial = read_sysfs(device, "device/serial") or read_sysfs(device, "serial")
+    return {"wwn": wwn, "serial": serial, "model": get_model(device)}
+
+
+def get_offload_limits(device: str) -> dict:
+    """
+    Capacités de déchargement noyau du périphérique :
+    write_zeroes_max_bytes (WRITE ZEROES matériel), discard_max_bytes et
+    discard_granularity. 0 signifie « non pris en charge ».
+    """
+    return {
+        "write_zeroes_max_bytes": read_sysfs_int(device, "queue/write_zeroes_max_bytes"),
+        "discard_max_bytes": read_sysfs_int(device, "queue/discard_max_bytes"),
+        "discard_granularity": read_sysfs_int(device, "queue/discard_granularity"),
+        "logical_block_size": read_sysfs_int(device, "queue/logical_block_size", 512),
+    }
+
+
+def range_ioctl(fd: int, request: int, start: int, length: int) -> None:
+    """Émet BLKZEROOUT / BLKDISCARD / BLKSECDISCARD sur [start, start + length)."""
+    fcntl.ioctl(fd, request, struct.pack("QQ", start, length))
+
+
+def reread_partitions(device: str) -> None:
+    """Demande au noyau de relire la table de partitions (BLKRRPART)."""
+    fd = os.open(f"/dev/{device.replace('/dev/', '')}", os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        fcntl.ioctl(fd, BLKRRPART)
+    finally:
+        os.close(fd)
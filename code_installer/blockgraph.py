@@ -0,0 +1,125 @@
+"""
+blockgraph.py – Graphe de dépendances des périphériques bloc (sysfs).
+
+Construit une fois à partir de /sys/class/block : pour chaque périphérique,
+ses esclaves (slaves : ce sur quoi il repose) et ses détenteurs (holders :
+ce qui repose sur lui), ainsi que le disque parent de chaque partition et
+le nom de mappage de chaque device-mapper (/dev/mapper/<nom>).
+
+Les empilements imbriqués (LUKS sur LVM sur RAID md, etc.) se résolvent
+par un simple parcours du graphe, sans aucun sous-processus :
+
+    graph = get_block_graph()
+    graph.physical_disks("/dev/mapper/vg-root")   # {"sda", "sdb"}
+
+Le graphe est conservé dans device_cache et reconstruit dès qu'un
+périphérique apparaît, disparaît ou change de détenteurs.
+"""
+import os
+from typing import Dict, List, Set
+
+from device_cache import device_cache
+
+SYS_CLASS_BLOCK = "/sys/class/block"
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def _listdir(path: str) -> List[str]:
+    try:
+        return sorted(os.listdir(path))
+    except OSError:
+        return []
+
+
+class BlockGraph:
+    """Relations slaves/holders entre périphériques bloc, indexées par nom noyau."""
+
+    def __init__(self) -> None:
+        self.slaves: Dict[str, List[str]] = {}
+        self.holders: Dict[str, List[str]] = {}
+        self.parent: Dict[str, str] = {}        # partition -> disque
+        self.aliases: Dict[str, str] = {}       # nom de mappage / md -> nom noyau
+
+    @classmethod
+    def build(cls, root: str = SYS_CLASS_BLOCK) -> "BlockGraph":
+        """Lit l'état courant de sysfs."""
+        graph = cls()
+        for name in _listdir(root):
+            path = os.path.join(root, name)
+            graph.slaves[name] = _listdir(os.path.join(path, "slaves"))
+            graph.holders[name] = _listdir(os.path.join(path, "holders"))
+            if os.path.exists(os.path.join(path, "partition")):
+                # /sys/devices/…/block/sda/sda1 : le parent est le répertoire englobant
+                graph.parent[name] = os.path.basename(os.path.dirname(os.path.realpath(path)))
+            dm_name = _read(os.path.join(path, "dm", "name"))
+            if dm_name:
+                graph.aliases[dm_name] = name
+        return graph
+
+    def resolve(self, device: str) -> str:
+        """
+        Nom noyau d'un chemin ou nom de périphérique :
+        /dev/mapper/vg-root -> dm-0, /dev/md/root -> md127, /dev/sda1 -> sda1.
+        """
+        if device.startswith("/dev/"):
+            real = os.path.realpath(device)
+            if os.path.basename(real) in self.slaves:
+                return os.path.basename(real)
+        name = device
+        for prefix in ("/dev/mapper/", "/dev/md/", "/dev/"):
+            if name.startswith(prefix):
+                name = name[len(prefix):]
+                break
+        if name in self.slaves:
+            return name
+        return self.aliases.get(name, name)
+
+    def physical_disks(self, device: str) -> Set[str]:
+        """
+        Disques entiers qui portent `device`, à travers toutes les couches
+        (dm-crypt, LVM, md, partitions). Un disque sans esclave se porte
+        lui-même ; ensemble vide si le périphérique est inconnu.
+        """
+        start = self.resolve(device)
+        if start not in self.slaves:
+            return set()
+        disks, stack, seen = set(), [start], set()
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in self.parent:
+                stack.append(self.parent[name])
+            elif self.slaves.get(name):
+                stack.extend(self.slaves[name])
+            else:
+                disks.add(name)
+        return disks
+
+    def dependents(self, device: str) -> Set[str]:
+        """Tout ce qui repose sur `device` (partitions comprises), transitivement."""
+        start = self.resolve(device)
+        children = {}
+        for partition, disk in self.parent.items():
+            children.setdefault(disk, []).append(partition)
+        found, stack = set(), [start]
+        while stack:
+            name = stack.pop()
+            for child in self.holders.get(name, []) + children.get(name, []):
+                if child not in found:
+                    found.add(child)
+                    stack.append(child)
+        return found
+
+
+def get_block_graph() -> BlockGraph:
+    """Graphe courant, reconstruit seulement si un périphérique a changé."""
+    return device_cache.get(None, "block_graph", BlockGraph.build)
@@ -1,12 +1,16 @@
 import sys
 import os
 import re
+import select
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from subprocess import CalledProcessError, SubprocessError
 from disk_erase import get_disk_serial, is_ssd
-from disk_operations import get_active_disk, process_disk
+from disk_operations import find_checkpoint, get_active_disk, plan_batch, process_disk
+from io_engine import SAMPLE_COUNT
+from progress import format_duration
 from utils import get_disk_list, choose_filesystem, get_base_disk
+from scheduler import JobScheduler, JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+from hotplug import HotplugMonitor
 from log_handler import (log_info, log_error, log_erase_operation, 
                         generate_session_pdf, generate_log_file_pdf, 
                         session_start, session_end, get_current_session_logs)
@@ -94,6 +98,36 @@ def print_disk_details(disk):
         log_error(f"Data type error getting disk details for {disk}: {str(e)}")
         return f"unknown_{disk}", False, False
 
+def report_hotplug(event, erasing=()) -> None:
+    """Print disks plugged or unplugged while the CLI is waiting or erasing (monitor thread)."""
+    if event.source != "kernel" or event.devtype != "disk":
+        return
+    disk = event.devname
+    if event.action == "add":
+        where = "added to the running batch" if erasing else "entered in the selection"
+        print(f"\n[Hotplug] New disk detected: /dev/{disk} (it can be {where})")
+    elif event.action == "remove":
+        if disk in erasing:
+            error_msg = f"Disk /dev/{disk} was removed while being erased!"
+            print(f"\n[Hotplug] {error_msg}")
+            log_error(error_msg)
+        else:
+            print(f"\n[Hotplug] Disk removed: /dev/{disk}")
+
+def parse_disk_selection(text: str) -> list[str]:
+    """Validate a comma-separated list of disk names (e.g. "sda,sdb")."""
+    valid_disks = []
+    for disk in [disk.strip() for disk in text.split(",") if disk.strip()]:
+        if re.match(r'^[a-zA-Z]+[0-9]*$', disk):
+            disk_path = f"/dev/{disk}"
+            if os.path.exists(disk_path):
+                valid_disks.append(disk)
+            else:
+                print(f"Disk {disk_path} not found. Skipping.")
+        else:
+            print(f"Invalid disk name format: {disk}. Skipping.")
+    return valid_disks
+
 def select_disks() -> list[str]:
     """
     Let the user select disks to erase from the command line, with detailed information.
@@ -185,21 +219,10 @@ def select_disks() -> list[str]:
         print("WARNING: If any of these disks are SSDs, using multiple passes may damage the SSD.")
         print("For SSDs, cryptographic erasure is recommended.\n")
         
-        selected_disks = input("Enter the disks to erase (comma-separated, e.g., sda,sdb): ").strip()
-        disk_names = [disk.strip() for disk in selected_disks.split(",") if disk.strip()]
-        
-        valid_disks = []
-        for disk in disk_names:
-            if re.match(r'^[a-zA-Z]+[0-9]*$', disk):
-                disk_path = f"/dev/{disk}"
-                if os.path.exists(disk_path):
-                    valid_disks.append(disk)
-                else:
-                    print(f"Disk {disk_path} not found. Skipping.")
-            else:
-                print(f"Invalid disk name format: {disk}. Skipping.")
-        
-        return valid_disks
+        # Disks plugged in while the user reads the list are announced immediately
+        with HotplugMonitor(report_hotplug):
+            selected_disks = input("Enter the disks to erase (comma-separated, e.g., sda,sdb): ").strip()
+        return parse_disk_selection(selected_disks)
         
     except KeyboardInterrupt:
         log_error("Disk selection interrupted by user (Ctrl+C)")
@@ -220,12 +243,15 @@ def get_erasure_method():
             print("=" * 50)
             print("1. Standard Overwrite (multiple passes)")
             print("2. Cryptographic Erasure (recommended for SSDs)")
+            print("3. Kernel Offload Erasure (WRITE ZEROES / SECURE DISCARD, fastest on SSDs)")
             print("-" * 50)
             
-            choice = input("Select erasure method (1-2): ").strip()
+            choice = input("Select erasure method (1-3): ").strip()
             
             if choice == "1":
-                return False, "random"  # use_crypto=False, crypto_fill doesn't matter
+                return False, "random", False  # use_crypto=False, crypto_fill doesn't matter
+            elif choice == "3":
+                return False, "random", True   # use_offload=True
             elif choice == "2":
                 # Get crypto fill method
                 while True:
@@ -239,13 +265,13 @@ def get_erasure_method():
                     fill_choice = input("Select fill method (1-2): ").strip()
                     
                     if fill_choice == "1":
-                        return True, "random"  # use_crypto=True, crypto_fill="random"
+                        return True, "random", False  # use_crypto=True, crypto_fill="random"
                     elif fill_choice == "2":
-                        return True, "zero"   # use_crypto=True, crypto_fill="zero"
+                        return True, "zero", False   # use_crypto=True, crypto_fill="zero"
                     else:
                         print("Invalid choice. Please enter 1 or 2.")
             else:
-                print("Invalid choice. Please enter 1 or 2.")
+                print("Invalid choice. Please enter 1, 2 or 3.")
                 
         except KeyboardInterrupt:
             print("\nOperation cancelled.")
@@ -325,9 +351,84 @@ def confirm_erasure(disk: str, fs_choice: str, method_description: str) -> bool:
             log_error(f"Input error during erasure confirmation: {str(e)}")
             return False
 
-def get_disk_confirmations(disks: list[str], fs_choice: str, passes: int, use_crypto: bool, crypto_fill: str) -> list[str]:
+def get_verify_mode() -> str:
+    """Ask whether the erased disks should be read back and checked"""
+    while True:
+        try:
+            print("\n" + "=" * 50)
+            print("            VERIFICATION AFTER ERASURE")
+            print("=" * 50)
+            print("1. No verification")
+            print("2. Full read-back (reads the whole disk again)")
+            print(f"3. Sampled read-back ({SAMPLE_COUNT} random blocks, a few minutes)")
+            print("-" * 50)
+
+            choice = input("Select verification mode (1-3): ").strip()
+
+            if choice == "1":
+                return "none"
+            elif choice == "2":
+                return "full"
+            elif choice == "3":
+                return "sample"
+            else:
+                print("Invalid choice. Please enter 1, 2 or 3.")
+        except KeyboardInterrupt:
+            log_error("Verification selection interrupted by user (Ctrl+C)")
+            sys.exit(130)
+        except (EOFError, IOError) as e:
+            log_error(f"Input error during verification selection: {str(e)}")
+            return "none"
+
+def print_batch_plan(plans, makespan: float) -> None:
+    """Show the estimated duration and finish time of each disk, longest first."""
+    now = time.time()
+    print("\n" + "=" * 78)
+    print("            BATCH PLAN (longest jobs first)")
+    print("=" * 78)
+    print(f"{'Disk':<10} {'Model':<22} {'Size':>9} {'Rate':>10} {'Source':<11} {'Duration':>9} {'Finish':>6}")
+    print("-" * 78)
+    for plan in plans:
+        print(f"{plan.disk:<10} {(plan.model or '-')[:22]:<22} {plan.size / 1e9:>7.0f}GB "
+              f"{plan.rate / 1e6:>6.0f}MB/s {plan.source:<11} {format_duration(plan.duration):>9} "
+              f"{time.strftime('%H:%M', time.localtime(now + plan.finish)):>6}")
+    print("-" * 78)
+    finish = time.strftime('%a %H:%M', time.localtime(now + makespan))
+    print(f"Predicted batch finish: {finish} (in {format_duration(makespan)})")
+    log_info(f"Predicted batch finish: {finish} (in {format_duration(makespan)})")
+
+def get_resume_choices(disks: list[str], passes: int) -> set:
+    """Offer to resume each disk whose previous overwrite was interrupted."""
+    resume_disks = set()
+    for disk in disks:
+        found = find_checkpoint(disk, passes)
+        if not found:
+            continue
+        disk_id, summary = found
+        while True:
+            try:
+                answer = input(f"Interrupted erasure found for {disk_id} (/dev/{disk}): {summary}. "
+                               "Resume from checkpoint? (y/n): ").strip().lower()
+            except KeyboardInterrupt:
+                log_error("Resume selection interrupted by user (Ctrl+C)")
+                sys.exit(130)
+            except (EOFError, IOError) as e:
+                log_error(f"Input error during resume selection: {str(e)}")
+                answer = "n"
+            if answer in ("y", "n"):
+                break
+            print("Please enter 'y' or 'n'.")
+        if answer == "y":
+            resume_disks.add(disk)
+            log_info(f"Resuming interrupted erasure of {disk_id} from checkpoint")
+    return resume_disks
+
+def get_disk_confirmations(disks: list[str], fs_choice: str, passes: int, use_crypto: bool, crypto_fill: str,
+                           use_offload: bool = False) -> list[str]:
     """Get confirmation for each disk with operation details."""
-    if use_crypto:
+    if use_offload:
+        method_description = "kernel offload erasure (WRITE ZEROES / SECURE DISCARD)"
+    elif use_crypto:
         fill_method = "zeros" if crypto_fill == "zero" else "random data"
         method_description = f"cryptographic erasure (filling with {fill_method})"
     else:
@@ -424,7 +525,8 @@ def print_complete_log_cli() -> None:
         print(error_msg)
         log_error(error_msg)
 
-def cli_process_disk(disk, fs_choice, passes, use_crypto=False, crypto_fill="random"):
+def cli_process_disk(disk, fs_choice, passes, use_crypto=False, crypto_fill="random", use_offload=False,
+                     verify="none", sample_count=SAMPLE_COUNT, resume=False):
     """
     Process a single disk for the CLI interface with status output.
     
@@ -443,13 +545,15 @@ def cli_process_disk(disk, fs_choice, passes, use_crypto=False, crypto_fill="ran
             print(f"  {message}")
         
         # Indicate if the disk is an SSD and not using crypto
-        if is_ssd(disk) and not use_crypto:
+        if is_ssd(disk) and not use_crypto and not use_offload:
             warning_msg = f"WARNING: {disk_id} is an SSD - multiple-pass erasure may not be effective"
             print(f"  {warning_msg}")
             log_info(warning_msg)
         
         # Process the disk using the imported function with crypto flag and filling method
-        process_disk(disk, fs_choice, passes, use_crypto, crypto_fill, log_func=log_progress)
+        process_disk(disk, fs_choice, passes, use_crypto, crypto_fill, log_func=log_progress,
+                     use_offload=use_offload, verify=verify, sample_count=sample_count,
+                     resume=resume)
         
         success_msg = f"Successfully completed all operations on disk {disk_id}"
         print(success_msg)
@@ -486,6 +590,57 @@ def cli_process_disk(disk, fs_choice, passes, use_crypto=False, crypto_fill="ran
         log_error(error_msg)
         return False
 
+JOB_LABELS = {
+    JOB_QUEUED: "waiting for a free slot",
+    JOB_RUNNING: "erasing",
+    JOB_DONE: "done",
+    JOB_FAILED: "failed",
+}
+
+def job_outcome(job) -> str:
+    """Job state, counting a cli_process_disk that returned False as failed."""
+    if job.state == JOB_DONE and job.future.result() is False:
+        return JOB_FAILED
+    return job.state
+
+def print_job_status(scheduler) -> None:
+    """Print the state of every job of the batch."""
+    print("\n" + "-" * 50)
+    for disk, job in sorted(scheduler.jobs().items()):
+        state = JOB_LABELS.get(job_outcome(job), job.state)
+        error = f" ({job.error})" if job.error else ""
+        print(f"  /dev/{disk:<12} {state}{error}")
+    print("-" * 50)
+
+def wait_for_jobs(scheduler, add_disks) -> None:
+    """
+    Wait for every job to finish while reading stdin: a comma-separated list
+    of disks adds them to the running batch, 'status' lists the jobs.
+    """
+    print("\nWhile the batch runs, type disk names (comma-separated) to add them, "
+          "or 'status' to list the jobs.")
+    while scheduler.pending():
+        try:
+            ready, _, _ = select.select([sys.stdin], [], [], 1.0)
+        except (OSError, ValueError):
+            # stdin cannot be polled: only wait
+            scheduler.wait()
+            break
+        if not ready:
+            continue
+        line = sys.stdin.readline()
+        if not line:
+            # stdin closed: nothing more can be added
+            scheduler.wait()
+            break
+        line = line.strip()
+        if line.lower() == "status":
+            print_job_status(scheduler)
+        elif line:
+            disks = parse_disk_selection(line)
+            if disks:
+                add_disks(disks)
+
 def run_disk_erasure_operation(args=None):
     """Run the disk erasure operation workflow"""
     try:
@@ -503,13 +658,17 @@ def run_disk_erasure_operation(args=None):
             fs_choice = choose_filesystem()
             
         # Get erasure method
-        if args and hasattr(args, 'crypto') and args.crypto:
+        use_offload = False
+        if args and getattr(args, 'offload', False):
+            use_crypto, crypto_fill, use_offload = False, "random", True
+            passes = 1  # Not used for offload
+        elif args and hasattr(args, 'crypto') and args.crypto:
             use_crypto = True
             crypto_fill = "zero" if (hasattr(args, 'zero') and args.zero) else "random"
             passes = 1  # Not used for crypto
         else:
-            use_crypto, crypto_fill = get_erasure_method()
-            if use_crypto:
+            use_crypto, crypto_fill, use_offload = get_erasure_method()
+            if use_crypto or use_offload:
                 passes = 1  # Not used for crypto
             else:
                 if args and args.passes:
@@ -517,10 +676,23 @@ def run_disk_erasure_operation(args=None):
                 else:
                     passes = get_passes()
         
+        # Read-back verification does not apply to cryptographic erasure
+        if use_crypto:
+            verify = "none"
+        elif args and getattr(args, 'verify', None):
+            verify = args.verify
+        else:
+            verify = get_verify_mode()
+        sample_count = getattr(args, 'verify_samples', None) or SAMPLE_COUNT
+
         print(f"Selected filesystem: {fs_choice}")
         log_info(f"Selected filesystem: {fs_choice}")
         
-        if use_crypto:
+        if use_offload:
+            method_msg = "Erasure method: Kernel offload erasure (WRITE ZEROES / SECURE DISCARD)"
+            print(method_msg)
+            log_info(method_msg)
+        elif use_crypto:
             fill_method = "zeros" if crypto_fill == "zero" else "random data"
             method_msg = f"Erasure method: Cryptographic erasure (filling with {fill_method})"
             print(method_msg)
@@ -529,35 +701,69 @@ def run_disk_erasure_operation(args=None):
             method_msg = f"Erasure method: Standard with {passes} passes"
             print(method_msg)
             log_info(method_msg)
+        if verify != "none":
+            verify_msg = f"Verification after erasure: {verify} read-back"
+            if verify == "sample":
+                verify_msg += f" ({sample_count} random blocks)"
+            print(verify_msg)
+            log_info(verify_msg)
+        
+        # Estimate every disk from model history or a read probe, longest job first
+        method = "offload" if use_offload else "crypto" if use_crypto else "overwrite"
+        print("\nEstimating erasure time of each disk...")
+        plans, makespan = plan_batch(disks, passes, method, verify, sample_count)
+        print_batch_plan(plans, makespan)
+        disks = [plan.disk for plan in plans]
+        rates = {plan.disk: plan.rate for plan in plans}
         
         # Then, get confirmation for each disk with detailed operation info
-        confirmed_disks = get_disk_confirmations(disks, fs_choice, passes, use_crypto, crypto_fill)
+        confirmed_disks = get_disk_confirmations(disks, fs_choice, passes, use_crypto, crypto_fill, use_offload)
         if not confirmed_disks:
             print("No disks confirmed for erasure. Returning to main menu.")
             return
         
+        # Overwrite runs interrupted by a crash or power loss can pick up where they stopped
+        resume_disks = set() if (use_crypto or use_offload) else get_resume_choices(confirmed_disks, passes)
+
         print("\nAll disks confirmed. Starting operations...\n")
         operation_start_msg = f"Starting disk erasure operations on {len(confirmed_disks)} disk(s)"
         log_info(operation_start_msg)
         
-        with ThreadPoolExecutor() as executor:
-            # Use our cli_process_disk function with the crypto flag and crypto_fill option
-            futures = [executor.submit(cli_process_disk, disk, fs_choice, passes, use_crypto, crypto_fill) for disk in confirmed_disks]
-            
-            completed = 0
-            for future in as_completed(futures):
+        # One job per disk; disks sharing a USB hub or SAS expander are throttled per link.
+        # The scheduler stays open until every job is done, so more disks can join the batch.
+        scheduler = JobScheduler(log_func=log_info)
+
+        def submit_disks(batch):
+            for disk in batch:
                 try:
-                    result = future.result()
-                    if result:
-                        completed += 1
-                except (RuntimeError, ValueError, TypeError) as e:
-                    error_msg = f"Thread execution error processing disk: {str(e)}"
+                    # Use our cli_process_disk function with the crypto flag and crypto_fill option
+                    scheduler.submit(disk, cli_process_disk, disk, fs_choice, passes, use_crypto, crypto_fill,
+                                     use_offload, verify, sample_count, disk in resume_disks,
+                                     rate=rates.get(disk, 0.0))
+                except ValueError as e:
+                    print(f"Skipping /dev/{disk}: {str(e)}")
+                except RuntimeError as e:
+                    error_msg = f"Could not queue /dev/{disk}: {str(e)}"
+                    print(error_msg)
                     log_error(error_msg)
-                except (TimeoutError, InterruptedError) as e:
-                    error_msg = f"Thread timeout/interrupt error processing disk: {str(e)}"
-                    log_error(error_msg)
-        
-        completion_msg = f"Completed operations on {completed}/{len(confirmed_disks)} disks."
+
+        def add_disks(batch):
+            batch = [disk for disk in batch if disk not in scheduler.pending()]
+            added = get_disk_confirmations(batch, fs_choice, passes, use_crypto, crypto_fill, use_offload)
+            if not (use_crypto or use_offload):
+                resume_disks.update(get_resume_choices(added, passes))
+            if added:
+                log_info(f"Adding {len(added)} disk(s) to the running batch: {', '.join(added)}")
+            submit_disks(added)
+
+        monitor = HotplugMonitor(lambda event: report_hotplug(event, scheduler.pending()))
+        with monitor, scheduler:
+            submit_disks(confirmed_disks)
+            wait_for_jobs(scheduler, add_disks)
+
+        jobs = scheduler.jobs()
+        completed = sum(1 for job in jobs.values() if job_outcome(job) == JOB_DONE)
+        completion_msg = f"Completed operations on {completed}/{len(jobs)} disks."
         print(f"\n{completion_msg}")
         log_info(completion_msg)
         
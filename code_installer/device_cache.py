@@ -0,0 +1,115 @@
+"""
+device_cache.py – Cache des métadonnées de disques invalidé par changement réel.
+
+Chaque périphérique bloc reçoit une empreinte peu coûteuse, lue dans sysfs
+et dans la base udev sans lancer de processus :
+
+  - diskseq (numéro de séquence du support, noyau ≥ 5.15), sinon
+    majeur:mineur ; le WWN udev complète la clé quand il est connu ;
+  - taille, partitions, détenteurs (holders) et esclaves (slaves) ;
+  - date de modification des entrées /run/udev/data du disque et de ses
+    partitions (réécrites par udevd à chaque uevent « change »).
+
+Une entrée n'est recalculée que si l'empreinte de son disque a changé ou
+si elle a été invalidée explicitement (uevent, partitionnement ou
+formatage effectués par l'application) ; un rafraîchissement sans
+changement ne coûte que quelques lectures de fichiers.
+"""
+import os
+import threading
+from typing import Callable, Optional
+
+from blkdev import SYS_BLOCK, UDEV_DATA, read_sysfs, read_udev_properties
+
+
+def _udev_mtime(dev_number: str) -> int:
+    if not dev_number:
+        return 0
+    try:
+        return os.stat(os.path.join(UDEV_DATA, f"b{dev_number}")).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def device_stamp(device: str) -> tuple:
+    """Empreinte de l'état courant d'un périphérique bloc (tuple vide s'il a disparu)."""
+    device = device.replace("/dev/", "")
+    dev_number = read_sysfs(device, "dev")
+    if not dev_number:
+        return ()
+    try:
+        entries = os.listdir(os.path.join(SYS_BLOCK, device))
+    except OSError:
+        return ()
+    partitions = sorted(e for e in entries if e.startswith(device))
+    links = []
+    for kind in ("holders", "slaves"):
+        try:
+            links.append(tuple(sorted(os.listdir(os.path.join(SYS_BLOCK, device, kind)))))
+        except OSError:
+            links.append(())
+    return (
+        read_sysfs(device, "diskseq") or dev_number,
+        read_udev_properties(device).get("ID_WWN", ""),
+        read_sysfs(device, "size"),
+        tuple(partitions),
+        tuple(links),
+        _udev_mtime(dev_number),
+        tuple(_udev_mtime(read_sysfs(f"{device}/{p}", "dev")) for p in partitions),
+    )
+
+
+def system_stamp() -> tuple:
+    """Empreinte de l'ensemble des périphériques bloc (/sys/block)."""
+    try:
+        devices = sorted(os.listdir(SYS_BLOCK))
+    except OSError:
+        return ()
+    return tuple((device, device_stamp(device)) for device in devices)
+
+
+class DeviceCache:
+    """
+    Valeurs calculées par (périphérique, champ), conservées tant que
+    l'empreinte du périphérique ne change pas. Utilisable depuis plusieurs
+    threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries = {}          # device -> (stamp, {champ: valeur})
+
+    def get(self, device: Optional[str], field: str, compute: Callable[[], object]):
+        """
+        Valeur de `field` pour `device`, recalculée par compute() si le disque
+        a changé. device=None : valeur globale (inventaire), liée à l'état de
+        tous les périphériques.
+        """
+        if device is not None:
+            device = device.replace("/dev/", "")
+        stamp = system_stamp() if device is None else device_stamp(device)
+        with self._lock:
+            entry = self._entries.get(device)
+            if entry and entry[0] == stamp and field in entry[1]:
+                return entry[1][field]
+        value = compute()
+        with self._lock:
+            entry = self._entries.get(device)
+            if not entry or entry[0] != stamp:
+                entry = (stamp, {})
+                self._entries[device] = entry
+            entry[1][field] = value
+        return value
+
+    def invalidate(self, device: Optional[str] = None) -> None:
+        """Oublie un périphérique et l'inventaire global (tout le cache si device vaut None)."""
+        with self._lock:
+            if device is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(device.replace("/dev/", ""), None)
+                self._entries.pop(None, None)
+
+
+# Cache partagé par l'inventaire, l'identification et les interfaces
+device_cache = DeviceCache()
@@ -1,8 +1,8 @@
 import logging
+from device_cache import device_cache
 from utils import run_command
 from subprocess import CalledProcessError
 import sys
-import time
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -55,8 +55,10 @@ def format_disk(disk: str, fs_choice: str, label: str = None) -> None:
     partition_name = get_partition_name(disk_name)
     partition = f"/dev/{partition_name}"
 
-    logging.info(f"Attente de reconnaissance de la partition {partition}…")
-    time.sleep(2)
+    from disk_partition import wait_for_partition
+    if not wait_for_partition(disk_name):
+        logging.error(f"Partition {partition} introuvable, formatage impossible.")
+        sys.exit(1)
 
     lbl = _sanitize_label(label or "", fs_choice)
     label_applied_via_mkfs = False
@@ -96,6 +98,9 @@ def format_disk(disk: str, fs_choice: str, label: str = None) -> None:
         if lbl and not label_applied_via_mkfs:
             apply_disk_label(partition, fs_choice, lbl)
 
+        # Nouveau système de fichiers : les métadonnées en cache sont périmées
+        device_cache.invalidate(disk_name)
+
     except FileNotFoundError:
         logging.error(f"Utilitaire de formatage introuvable pour {fs_choice}. Assurez-vous que les outils nécessaires sont installés.")
         sys.exit(2)
@@ -2,62 +2,101 @@
 disk_operations.py (installer) – Orchestration effacement / partition / formatage.
 Identique au mode live mais enregistre chaque succès dans le compteur de supports.
 """
-import re
-import time
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from subprocess import CalledProcessError
 
-from disk_erase import erase_disk_crypto, erase_disk_hdd, get_disk_serial, is_ssd
+from blkdev import get_model, is_rotational, read_sysfs_int
+from checkpoint import describe_checkpoint, load_checkpoint
+from disk_erase import erase_disk_crypto, erase_disk_hdd, erase_disk_offload, get_disk_serial, is_ssd
 from disk_format import format_disk
 from disk_partition import partition_disk
+from io_engine import SAMPLE_BLOCK_SIZE, SAMPLE_COUNT, probe_read_rate
 from log_handler import log_error, log_info, log_erase_operation
+from mount_index import get_mount_index
+from progress import ProgressTracker
+from scheduler import HDD_RATE, SSD_RATE, group_disks
+from throughput_history import get_throughput
 from stats_manager import record_wipe
-from utils import get_base_disk, get_physical_drives_for_logical_volumes, run_command
+from utils import run_command
 
 
 def process_disk(disk: str, fs_choice: str, passes: int,
                  use_crypto: bool = False, crypto_fill: str = "random",
                  log_func=None, label: str = None,
                  progress_callback=None,
-                 partition_table: str = "mbr") -> None:
+                 partition_table: str = "mbr",
+                 use_offload: bool = False,
+                 verify: str = "none",
+                 sample_count: int = SAMPLE_COUNT,
+                 resume: bool = False) -> None:
     """
     Efface, partitionne et formate un disque.
     Incrémente le compteur de supports blanchis en cas de succès.
     label : libellé à appliquer après formatage (None = aucun libellé).
+    use_offload : effacement délégué au contrôleur (BLKZEROOUT / BLKSECDISCARD).
+    verify : "full" relit tout le disque après l'effacement et le compare au
+    dernier motif écrit, "sample" n'en relit que `sample_count` blocs tirés au
+    hasard (sans objet pour l'effacement cryptographique).
+    resume : reprend l'écrasement au dernier point de reprise du disque
+    (voir find_checkpoint) au lieu de le recommencer.
+    progress_callback : reçoit des progress.ProgressEvent (débit, passe, ETA)
+    pour chaque étape, limités à progress.EVENT_INTERVAL.
     """
     def _log(msg: str) -> None:
         log_info(msg)
         if log_func:
             log_func(msg)
 
+    plan = "offload" if use_offload else "crypto" if use_crypto else "overwrite"
+    if verify != "none" and not use_crypto:
+        plan += "_sample" if verify == "sample" else "_verify"
+    tracker = ProgressTracker(disk, progress_callback, plan) if progress_callback else None
+
     try:
         disk_id = get_disk_serial(disk)
         _log(f"Traitement du disque : {disk_id}")
 
-        if is_ssd(disk) and not use_crypto:
+        if is_ssd(disk) and not use_crypto and not use_offload:
             _log(f"AVERTISSEMENT : {disk_id} est un SSD. "
                  "L'effacement multi-passes peut être insuffisant.")
 
         # ── Effacement ──
-        if use_crypto:
+        if use_offload:
+            method_str = "Effacement matériel (déchargement noyau)"
+            _log(f"Méthode : {method_str}")
+            erase_disk_offload(disk, log_func=log_func, progress=tracker, verify=verify,
+                               sample_count=sample_count)
+        elif use_crypto:
             method_str = f"Effacement cryptographique ({crypto_fill})"
             _log(f"Méthode : {method_str}")
-            erase_disk_crypto(disk, filling_method=crypto_fill, log_func=log_func)
+            if verify != "none":
+                _log("Vérification ignorée : le contenu chiffré n'est pas prévisible.")
+            erase_disk_crypto(disk, filling_method=crypto_fill, log_func=log_func, progress=tracker)
         else:
             method_str = f"{passes} passe(s) d'écrasement"
             _log(f"Méthode : {method_str}")
-            erase_disk_hdd(disk, passes, log_func=log_func)
+            erase_disk_hdd(disk, passes, log_func=log_func, progress=tracker, verify=verify,
+                           sample_count=sample_count, resume=resume)
 
         _log(f"Effacement terminé : {disk_id}")
 
         # ── Partitionnement ──
         _log(f"Création de la partition sur {disk_id}")
-        partition_disk(disk, partition_table=partition_table)
-        _log("Attente de reconnaissance de la partition…")
-        time.sleep(5)
+        if tracker:
+            tracker.stage_started("partition")
+        partition_disk(disk, partition_table=partition_table, fs_choice=fs_choice)
+        if tracker:
+            tracker.stage_done("partition")
 
         # ── Formatage ──
         _log(f"Formatage de {disk_id} en {fs_choice}")
+        if tracker:
+            tracker.stage_started("format")
         format_disk(disk, fs_choice, label=label)
+        if tracker:
+            tracker.stage_done("format")
 
         # ── Journalisation opération ──
         log_erase_operation(disk_id, fs_choice, method_str)
@@ -93,46 +132,103 @@ def process_disk(disk: str, fs_choice: str, passes: int,
         raise
 
 
+def find_checkpoint(disk: str, passes: int):
+    """
+    Retourne (identifiant, résumé) si un écrasement en `passes` passe(s) de
+    `disk` a été interrompu et peut être repris, sinon None.
+    """
+    disk_id = get_disk_serial(disk)
+    data = load_checkpoint(disk_id)
+    if not data or data.get("method") != "overwrite" or data["state"].get("pass_count") != passes:
+        return None
+    return disk_id, describe_checkpoint(data)
+
+
+@dataclass
+class DiskPlan:
+    """Estimation de durée d'un disque du lot."""
+    disk: str
+    model: str
+    size: int                 # octets
+    rate: float               # octets/s retenus pour l'estimation
+    source: str               # "historique", "sondage" ou "défaut"
+    duration: float           # secondes
+    finish: float = 0.0       # secondes après le début du lot
+
+
+def estimate_duration(size: int, rate: float, method: str, passes: int,
+                      verify: str = "none", sample_count: int = SAMPLE_COUNT) -> float:
+    """Durée estimée (s) de l'effacement puis de la vérification éventuelle."""
+    rate = max(rate, 1.0)
+    duration = size * (passes if method == "overwrite" else 1) / rate
+    if method != "crypto":
+        if verify == "full":
+            duration += size / rate
+        elif verify == "sample":
+            duration += sample_count * SAMPLE_BLOCK_SIZE / rate
+    return duration
+
+
+def _disk_rate(disk: str, model: str, method: str) -> tuple:
+    """(débit, source) : historique du modèle, sinon lecture de sondage."""
+    rate = get_throughput(model, method)
+    if rate:
+        return rate, "historique"
+    try:
+        return probe_read_rate(f"/dev/{disk}"), "sondage"
+    except OSError as e:
+        log_error(f"Sondage de débit impossible pour {disk} : {e}")
+        return (HDD_RATE if is_rotational(disk) else SSD_RATE), "défaut"
+
+
+def plan_batch(disks: list, passes: int, method: str = "overwrite", verify: str = "none",
+               sample_count: int = SAMPLE_COUNT):
+    """
+    Estime la durée de chaque disque (débit historique du modèle pour la
+    méthode, sinon sondage en lecture non destructif) et ordonne le lot du
+    plus long au plus court (LPT), ce qui minimise la durée totale quand
+    des disques partagent un lien limité (scheduler.JobScheduler, qui
+    les regroupe par lien avec group_disks).
+    method : "overwrite", "crypto" ou "offload".
+    Retourne (plans ordonnés, durée totale estimée en secondes).
+    """
+    names = [d.replace("/dev/", "") for d in disks]
+    models = {name: get_model(name) for name in names}
+    with ThreadPoolExecutor(max_workers=max(1, len(names))) as executor:
+        rates = dict(zip(names, executor.map(lambda n: _disk_rate(n, models[n], method), names)))
+
+    plans = {}
+    for disk, name in zip(disks, names):
+        rate, source = rates[name]
+        size = read_sysfs_int(name, "size") * 512
+        plans[disk] = DiskPlan(disk, models[name], size, rate, source,
+                               estimate_duration(size, rate, method, passes, verify, sample_count))
+
+    ordered = sorted(plans.values(), key=lambda p: p.duration, reverse=True)
+
+    # Simulation des créneaux de chaque groupe de lien, dans l'ordre LPT
+    for group in group_disks(disks, {p.disk: p.rate for p in ordered}):
+        slots = [0.0] * group.slots
+        for plan in (p for p in ordered if p.disk in group.disks):
+            start = heapq.heappop(slots)
+            plan.finish = start + plan.duration
+            heapq.heappush(slots, plan.finish)
+
+    makespan = max((p.finish for p in ordered), default=0.0)
+    return ordered, makespan
+
+
 def get_active_disk():
     """
-    Détecte le(s) disque(s) physique(s) hébergeant le système de fichiers racine.
+    Détecte le(s) disque(s) physique(s) dont dépend le système en cours :
+    racine et montages vitaux, swap, couches squashfs/overlay et média de
+    démarrage d'un système live (voir mount_index.py).
     Retourne une liste de noms de base (ex. ['nvme0n1', 'sda']) ou None.
     """
     try:
-        devices = set()
-
-        with open("/proc/mounts", "r") as f:
-            mounts_content = f.read()
-
-        root_device = None
-        for line in mounts_content.split("\n"):
-            if " / " in line and line.strip():
-                root_device = line.split()[0]
-                break
-
-        if not root_device or root_device in ("rootfs", "overlay", "aufs", "/dev/root"):
-            # Live boot – cherche le média de boot dans les montages
-            with open("/proc/mounts", "r") as f:
-                for line in f:
-                    parts = line.split()
-                    if len(parts) < 6:
-                        continue
-                    device, mp = parts[0], parts[1]
-                    if any(k in mp for k in ("/run/live", "/lib/live", "/live/", "/cdrom")):
-                        m = re.search(r"/dev/([a-zA-Z]+\d*[a-zA-Z]*\d*)", device)
-                        if m:
-                            devices.add(get_base_disk(m.group(1)))
-        else:
-            if "/dev/mapper/" in root_device or "/dev/dm-" in root_device:
-                for drive in get_physical_drives_for_logical_volumes([root_device]):
-                    devices.add(get_base_disk(drive))
-            else:
-                m = re.search(r"/dev/([a-zA-Z]+\d*[a-zA-Z]*\d*)", root_device)
-                if m:
-                    devices.add(get_base_disk(m.group(1)))
-
-        return list(devices) if devices else None
+        devices = get_mount_index().system_disks()
+        return sorted(devices) if devices else None
 
-    except (OSError, ValueError, re.error) as e:
+    except (OSError, ValueError) as e:
         log_error(f"Erreur détection disque actif : {e}")
         return None
\ No newline at end of file
@@ -1,51 +1,110 @@
 import logging
+import os
+import shutil
+import stat
+import subprocess
+from blkdev import reread_partitions
+from device_cache import device_cache
+from partition_table import write_partition_table
 from utils import run_command
 import sys
 import time
-from subprocess import CalledProcessError
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+PARTITION_TIMEOUT = 30.0    # secondes max d'attente du nœud de partition
+POLL_START = 0.01           # premier intervalle de scrutation sysfs
+POLL_MAX = 0.25             # intervalle maximal (backoff exponentiel)
+
 
 def get_partition_name(disk_name: str) -> str:
     """
     Retourne le nom de la première partition pour un disque donné.
-    Gère NVMe (nvme0n1 -> nvme0n1p1) et disques standards (sda -> sda1).
+    Comme le noyau, insère un « p » si le nom du disque finit par un
+    chiffre (nvme0n1 -> nvme0n1p1, mmcblk0 -> mmcblk0p1, sda -> sda1).
     """
     disk_name = disk_name.replace('/dev/', '')
-    if 'nvme' in disk_name:
+    if disk_name[-1:].isdigit():
         return f"{disk_name}p1"
     else:
         return f"{disk_name}1"
 
 
-def partition_disk(disk: str, partition_table: str = "mbr") -> None:
+def _partition_ready(partition_name: str) -> bool:
+    """Vrai si la partition est connue du noyau et son nœud /dev est un périphérique bloc."""
+    if not os.path.exists(f"/sys/class/block/{partition_name}"):
+        return False
+    try:
+        return stat.S_ISBLK(os.stat(f"/dev/{partition_name}").st_mode)
+    except OSError:
+        return False
+
+
+def wait_for_partition(disk: str, timeout: float = PARTITION_TIMEOUT) -> bool:
+    """
+    Attend que la première partition de `disk` soit utilisable, sans délai fixe :
+    udevadm settle limité à ce nœud (rend la main dès qu'il existe), puis
+    scrutation de /sys/class/block et de /dev avec un backoff court.
+    Retourne False si la partition n'apparaît pas avant `timeout` secondes.
+    """
+    partition_name = get_partition_name(disk)
+    if _partition_ready(partition_name):
+        return True
+
+    deadline = time.monotonic() + timeout
+    if shutil.which("udevadm"):
+        subprocess.run(
+            ["udevadm", "settle", f"--exit-if-exists=/dev/{partition_name}", f"--timeout={int(timeout)}"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+
+    delay = POLL_START
+    while True:
+        if _partition_ready(partition_name):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, POLL_MAX)
+
+
+def partition_disk(disk: str, partition_table: str = "mbr", fs_choice: str = None) -> None:
     """
     Partitionne le disque avec la table de partitions choisie.
     partition_table : "mbr" (msdos) ou "gpt". Défaut : "mbr".
-    Gère correctement les disques NVMe et standards.
+    fs_choice : système de fichiers prévu, pour le type de partition
+    (Linux par défaut, comme parted).
+    La table est écrite en processus (partition_table.py) puis relue par le
+    noyau via BLKRRPART. Gère correctement les disques NVMe et standards.
     """
-    table = "msdos" if partition_table.lower() == "mbr" else "gpt"
     disk_name = disk.replace('/dev/', '')
     print(f"Partitionnement de {disk_name} avec table {partition_table.upper()}...")
 
     try:
-        # Création de la table de partitions
-        run_command(["parted", f"/dev/{disk_name}", "--script", "mklabel", table])
-
-        # Partition primaire occupant 100% du disque
-        run_command(["parted", f"/dev/{disk_name}", "--script", "mkpart", "primary", "1Mib", "100%"])
+        # Table + partition primaire de 1 Mio à 100 %, écrites directement
+        write_partition_table(f"/dev/{disk_name}", partition_table, fs_choice)
 
-        # Informer le noyau
-        run_command(["partprobe", f"/dev/{disk_name}"])
+        # Informer le noyau (BLKRRPART ; partprobe si l'ioctl est refusé)
+        try:
+            reread_partitions(disk_name)
+        except OSError as e:
+            logging.info(f"BLKRRPART refusé sur {disk_name} ({e.strerror}), utilisation de partprobe")
+            run_command(["partprobe", f"/dev/{disk_name}"])
 
-        time.sleep(2)
+        if not wait_for_partition(disk_name):
+            logging.error(f"Erreur : la partition de {disk_name} n'est pas apparue "
+                          f"après {PARTITION_TIMEOUT:.0f} s.")
+            sys.exit(1)
 
+        device_cache.invalidate(disk_name)
         print(f"Disque {disk_name} partitionné avec succès ({partition_table.upper()}).")
 
-    except FileNotFoundError:
-        logging.error("Erreur : commande `parted` introuvable.")
-        sys.exit(2)
-    except CalledProcessError as e:
+    except ValueError as e:
+        logging.error(f"Erreur : table {partition_table.upper()} impossible sur {disk} : {e}")
+        sys.exit(1)
+    except OSError as e:
         logging.error(f"Erreur : échec du partitionnement de {disk} : {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -2,6 +2,7 @@ import os
 import sys
 import time
 import threading
+from collections import deque
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from subprocess import CalledProcessError, SubprocessError
@@ -9,7 +10,6 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List
 
 from disk_erase import get_disk_serial, is_ssd
-from utils import get_disk_list, get_base_disk
 from disk_partition import partition_disk
 from disk_format import format_disk
 from log_handler import (
@@ -21,12 +21,32 @@ from log_handler import (
 )
 from admin_interface import open_admin_panel
 from stats_manager import get_wipe_count
-from disk_operations import get_active_disk, process_disk
+from disk_operations import find_checkpoint, get_active_disk, plan_batch, process_disk
+from scheduler import JobScheduler, JOB_DONE, JOB_FAILED, JOB_QUEUED
+from progress import ProgressBus, ProgressEvent, ProgressTracker, format_duration
+from hotplug import HotplugMonitor, OVERFLOW
+from inventory_worker import InventoryWorker
 from config_manager import get_passes
 
 
 class DiskEraserGUI:
-    _REFRESH_INTERVAL_MS = 3000
+    _REFRESH_INTERVAL_MS = 3000      # scrutation de secours sans netlink
+    _HOTPLUG_DEBOUNCE_MS = 150       # regroupe les rafales d'uevents (disque + partitions)
+    _LOG_FLUSH_MS = 100              # cadence d'affichage du journal (≈ 10 images/s)
+    _LOG_MAX_LINES = 5000            # lignes conservées dans le widget du journal
+    _LOG_QUEUE_MAX = 20000           # messages en attente au-delà desquels les plus anciens sont perdus
+    _PROGRESS_FRAME_MS = 100         # échantillonnage du bus de progression (≈ 10 images/s)
+    _DISK_ROW_HEIGHT = 104           # hauteur fixe d'une ligne de la liste des disques (px)
+
+    _STAGE_LABELS = {
+        'erase': 'Écrasement',
+        'luks_format': 'Chiffrement LUKS',
+        'fill': 'Remplissage',
+        'header_wipe': "Effacement de l'en-tête",
+        'offload': 'Effacement matériel',
+        'partition': 'Partitionnement',
+        'format': 'Formatage',
+    }
 
     _BG = '#0b1220'
     _BG_ELEVATED = '#111b2e'
@@ -60,22 +80,33 @@ class DiskEraserGUI:
         self.passes_var = tk.StringVar(value=str(get_passes()))
         self.erase_method_var = tk.StringVar(value="overwrite")
         self.crypto_fill_var = tk.StringVar(value="random")
+        self.verify_var = tk.StringVar(value="none")  # "none"|"full"|"sample"
         self.label_mode_var = tk.StringVar(value="none")  # "none"|"preserve"|"custom"
         self.custom_label_var = tk.StringVar(value="")
         self.partition_table_var = tk.StringVar(value="mbr")  # "mbr"|"gpt"
         self.disks: List[Dict[str, str]] = []
         self.disk_progress: Dict[str, float] = {}
+        self._progress_events: Dict[str, ProgressEvent] = {}
         self.active_disk = get_active_disk()
 
         self.active_drive_logged = False
         self._erasing_devs: set = set()
-        self._disk_row_cache: Dict[str, dict] = {}
-        self._disk_rows: Dict[str, dict] = {}
+        self._job_states: Dict[str, str] = {}        # dernier état connu de chaque travail
+        self._batch_total = 0
+        self._batch_done = 0
+        self._planning = False
+        self._jobs = JobScheduler(log_func=self.update_gui_log, on_state=self._on_job_state)
+        self._disk_rows: Dict[str, dict] = {}       # état affiché de chaque disque
+        self._disk_order: List[str] = []
+        self._row_views: List[dict] = []            # widgets recyclés (lignes visibles)
+        self._row_view_by_dev: Dict[str, dict] = {}
         self._progress_phase_var = tk.StringVar(value="En attente")
         self._progress_detail_var = tk.StringVar(value="Aucune opération en cours")
         self._progress_stats_var = tk.StringVar(value="0 disque sélectionné")
         self._pending_unmount_dir = None
         self._no_disk_label = None
+        self._log_queue: deque = deque(maxlen=self._LOG_QUEUE_MAX)
+        self._progress_bus = ProgressBus()
 
         session_start()
 
@@ -85,8 +116,19 @@ class DiskEraserGUI:
             sys.exit(1)
 
         self.create_widgets()
+        self.root.after(self._LOG_FLUSH_MS, self._flush_gui_log)
+        self.root.after(self._PROGRESS_FRAME_MS, self._render_progress)
+        self._inventory = InventoryWorker(self._on_inventory)
+        self._inventory.start()
         self.refresh_disks()
-        self.root.after(self._REFRESH_INTERVAL_MS, self._auto_refresh_disks)
+
+        # Rafraîchissement sur uevent ; minuterie seulement si netlink est indisponible
+        self._hotplug_pending = False
+        self._hotplug = HotplugMonitor(self._on_hotplug_event)
+        if self._hotplug.start():
+            log_info("Hotplug monitoring enabled (netlink uevents)")
+        else:
+            self.root.after(self._REFRESH_INTERVAL_MS, self._auto_refresh_disks)
 
     def _setup_theme(self) -> None:
         style = ttk.Style()
@@ -103,6 +145,15 @@ class DiskEraserGUI:
             relief='flat',
         )
         style.map('TScrollbar', background=[('active', self._SURFACE3)])
+        style.configure(
+            'Disk.Horizontal.TProgressbar',
+            background=self._ACCENT,
+            troughcolor=self._BG_ELEVATED,
+            bordercolor=self._BORDER_SOFT,
+            darkcolor=self._ACCENT,
+            lightcolor=self._ACCENT2,
+            thickness=6,
+        )
         style.configure(
             'TEntry',
             fieldbackground=self._BG_ELEVATED,
@@ -265,13 +316,11 @@ class DiskEraserGUI:
 
         self.disk_canvas = tk.Canvas(list_holder, bg=self._BG_ELEVATED, highlightthickness=0, bd=0)
         disk_sb = ttk.Scrollbar(list_holder, orient='vertical', command=self.disk_canvas.yview)
-        self.scrollable_disk_frame = tk.Frame(self.disk_canvas, bg=self._BG_ELEVATED)
-        self.scrollable_disk_frame.bind(
-            '<Configure>',
-            lambda e: self.disk_canvas.configure(scrollregion=self.disk_canvas.bbox('all')),
-        )
-        self.disk_canvas.create_window((0, 0), window=self.scrollable_disk_frame, anchor='nw')
-        self.disk_canvas.configure(yscrollcommand=disk_sb.set)
+        self._disk_scrollbar = disk_sb
+        # Liste virtualisée : seules les lignes visibles ont des widgets (_sync_row_views)
+        self.disk_canvas.configure(yscrollcommand=self._on_disk_scroll,
+                                   yscrollincrement=self._DISK_ROW_HEIGHT // 4)
+        self.disk_canvas.bind('<Configure>', lambda e: self._sync_row_views())
         self.disk_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         disk_sb.pack(side=tk.RIGHT, fill=tk.Y)
 
@@ -389,6 +438,34 @@ class DiskEraserGUI:
             font=('Segoe UI', 9), bd=0, highlightthickness=0,
         ).pack(anchor='w', pady=(2, 0))
 
+        # Déchargement noyau (WRITE ZEROES / SECURE DISCARD)
+        tk.Radiobutton(
+            inner, text='Effacement matériel (WRITE ZEROES / SECURE DISCARD)', value='offload',
+            variable=self.erase_method_var,
+            command=self.update_method_options,
+            bg=self._SURFACE, fg=self._TEXT,
+            selectcolor=self._BG_ELEVATED,
+            activebackground=self._SURFACE,
+            activeforeground=self._ACCENT2,
+            font=('Segoe UI', 9), bd=0, highlightthickness=0,
+        ).pack(anchor='w', pady=(2, 0))
+
+        # Relecture de vérification : aucune, complète ou échantillonnée
+        self.verify_frame = tk.Frame(inner, bg=self._SURFACE)
+        self.verify_frame.pack(fill=tk.X, pady=(4, 0))
+        tk.Label(self.verify_frame, text='Vérification :', bg=self._SURFACE, fg=self._TEXT_DIM,
+                 font=('Segoe UI', 9)).pack(side=tk.LEFT, padx=(0, 6))
+        for txt, val in [('Aucune', 'none'), ('Complète', 'full'), ('Échantillon', 'sample')]:
+            tk.Radiobutton(
+                self.verify_frame, text=txt, value=val,
+                variable=self.verify_var,
+                bg=self._SURFACE, fg=self._TEXT,
+                selectcolor=self._BG_ELEVATED,
+                activebackground=self._SURFACE,
+                activeforeground=self._ACCENT2,
+                font=('Segoe UI', 9), bd=0, highlightthickness=0,
+            ).pack(side=tk.LEFT, padx=(0, 6))
+
         # passes_frame kept as alias for update_method_options compatibility
         self.passes_frame = overwrite_row
 
@@ -542,28 +619,41 @@ class DiskEraserGUI:
         self._set_status('Prêt', 'idle')
 
     def _auto_refresh_disks(self) -> None:
-        if not self._erasing_devs:
-            self.refresh_disks()
+        self.refresh_disks()
         self.root.after(self._REFRESH_INTERVAL_MS, self._auto_refresh_disks)
 
+    def _on_hotplug_event(self, event) -> None:
+        """Appelé par le thread de surveillance : délègue au thread principal."""
+        self.root.after(0, self._queue_hotplug_refresh, event)
+
+    def _queue_hotplug_refresh(self, event) -> None:
+        if event.source == 'kernel' and event.devtype == 'disk':
+            if event.action == 'add':
+                self.update_gui_log(f"Disque branché : /dev/{event.devname}")
+            elif event.action == 'remove':
+                self.update_gui_log(f"Disque retiré : /dev/{event.devname}")
+        elif event.action == OVERFLOW:
+            self.update_gui_log("Rafale d'événements hotplug : inventaire complet relu")
+        if not self._hotplug_pending:
+            self._hotplug_pending = True
+            self.root.after(self._HOTPLUG_DEBOUNCE_MS, self._hotplug_refresh)
+
+    def _hotplug_refresh(self) -> None:
+        self._hotplug_pending = False
+        # Y compris pendant un lot : un disque branché peut y être ajouté
+        self.refresh_disks()
+
     @staticmethod
     def _build_disk_label(disk: dict, active_physical_drives: set) -> tuple:
         device_name = disk['device'].replace('/dev/', '')
 
-        try:
-            disk_identifier = get_disk_serial(device_name)
-        except Exception:
-            disk_identifier = device_name
+        # Identifiant et statut système déjà résolus par le thread d'inventaire
+        disk_identifier = disk.get('disk_id') or device_name
 
-        try:
-            ssd_indicator = ' (SSD)' if is_ssd(device_name) else ' (HDD)'
-        except Exception:
-            ssd_indicator = ' (Type inconnu)'
+        # Attribut sysfs déjà lu par l'inventaire (aucun processus par disque)
+        ssd_indicator = ' (HDD)' if disk.get('rotational', True) else ' (SSD)'
 
-        try:
-            is_active = get_base_disk(device_name) in active_physical_drives
-        except Exception:
-            is_active = False
+        is_active = disk.get('active', False)
 
         active_indicator = ' (DISQUE SYSTÈME ACTIF)' if is_active else ''
         disk_label_str = disk.get('label', 'Inconnu')
@@ -585,156 +675,218 @@ class DiskEraserGUI:
         text_color = 'red' if is_active else ('blue' if '(SSD)' in ssd_indicator else 'black')
         return id_text, details_text, text_color, is_active
 
-    def _create_disk_row(self, disk: dict, active_physical_drives: set) -> None:
-        dev = disk['device']
-        id_text, details_text, text_color, _ = self._build_disk_label(disk, active_physical_drives)
-        is_erasing = dev in self._erasing_devs
-        display_color = self._map_disk_color(text_color, is_erasing)
-        is_ssd_disk = '(SSD)' in id_text
-        is_active_disk = text_color == 'red'
+    def _create_row_view(self) -> dict:
+        """Widgets d'une ligne affichable, recyclés d'un disque à l'autre au défilement."""
+        outer = tk.Frame(self.disk_canvas, bg=self._BORDER_SOFT, padx=1, pady=1,
+                         height=self._DISK_ROW_HEIGHT - 10)
+        outer.pack_propagate(False)
 
-        var = tk.BooleanVar(value=is_erasing)
-        self.disk_vars[dev] = var
-
-        card_bg = self._SURFACE if not is_erasing else self._SURFACE2
-        outer = tk.Frame(self.scrollable_disk_frame, bg=self._BORDER_SOFT, padx=1, pady=1)
-        outer.pack(fill=tk.X, padx=8, pady=5)
-
-        disk_entry_frame = tk.Frame(outer, bg=card_bg, padx=12, pady=10)
+        disk_entry_frame = tk.Frame(outer, bg=self._SURFACE, padx=12, pady=10)
         disk_entry_frame.pack(fill=tk.BOTH, expand=True)
 
-        top = tk.Frame(disk_entry_frame, bg=card_bg)
+        top = tk.Frame(disk_entry_frame, bg=self._SURFACE)
         top.pack(fill=tk.X)
 
-        marker_color = self._DANGER if is_active_disk else self._WARNING if is_erasing else self._SSD_COLOR if is_ssd_disk else self._HDD_COLOR
-        tk.Frame(top, bg=marker_color, width=4, height=34).pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
+        marker = tk.Frame(top, bg=self._HDD_COLOR, width=4, height=34)
+        marker.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
 
         cb = tk.Checkbutton(
             top,
-            variable=var,
-            bg=card_bg,
-            fg=display_color,
-            activebackground=card_bg,
+            bg=self._SURFACE,
+            activebackground=self._SURFACE,
             selectcolor=self._BG_ELEVATED,
             bd=0,
             highlightthickness=0,
         )
-        if is_erasing:
-            cb.configure(state='disabled')
         cb.pack(side=tk.LEFT, pady=(1, 0))
 
-        text_col = tk.Frame(top, bg=card_bg)
+        text_col = tk.Frame(top, bg=self._SURFACE)
         text_col.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(4, 8))
 
-        id_label = tk.Label(text_col, text=id_text, fg=self._TEXT, bg=card_bg,
-                            wraplength=520, justify=tk.LEFT,
-                            font=('Segoe UI', 10, 'bold'))
+        id_label = tk.Label(text_col, fg=self._TEXT, bg=self._SURFACE, anchor='w',
+                            justify=tk.LEFT, font=('Segoe UI', 10, 'bold'))
         id_label.pack(anchor='w')
 
-        details_label = tk.Label(text_col, text=details_text, fg=self._TEXT_DIM, bg=card_bg,
-                                 wraplength=520, justify=tk.LEFT,
-                                 font=('Segoe UI', 9))
+        details_label = tk.Label(text_col, fg=self._TEXT_DIM, bg=self._SURFACE, anchor='w',
+                                 justify=tk.LEFT, font=('Segoe UI', 9))
         details_label.pack(anchor='w', pady=(4, 0))
 
-        if is_erasing:
-            badge_text, badge_bg, badge_fg = '⚙ EN COURS', self._WARNING, '#1a1a1a'
-        elif is_active_disk:
-            badge_text, badge_bg, badge_fg = '⚠ SYSTÈME', self._DANGER, '#ffffff'
-        elif is_ssd_disk:
-            badge_text, badge_bg, badge_fg = '◈ SSD', self._SSD_COLOR, '#08131d'
-        else:
-            badge_text, badge_bg, badge_fg = '◉ HDD', self._HDD_COLOR, '#08131d'
-
-        badge = tk.Label(top, text=badge_text, bg=badge_bg, fg=badge_fg,
-                         font=('Segoe UI', 8, 'bold'), padx=8, pady=4)
+        # Affichée seulement pendant un lot qui inclut le disque
+        progress_frame = tk.Frame(text_col, bg=self._SURFACE)
+        progress_bar = ttk.Progressbar(progress_frame, style='Disk.Horizontal.TProgressbar',
+                                       orient=tk.HORIZONTAL, mode='determinate',
+                                       maximum=100, length=220)
+        progress_bar.pack(side=tk.LEFT)
+        progress_label = tk.Label(progress_frame, text='', fg=self._TEXT_DIM, bg=self._SURFACE,
+                                  font=('Segoe UI', 9))
+        progress_label.pack(side=tk.LEFT, padx=(8, 0))
+
+        badge = tk.Label(top, font=('Segoe UI', 8, 'bold'), padx=8, pady=4)
         badge.pack(side=tk.RIGHT, anchor='n')
 
-        sep = tk.Frame(self.scrollable_disk_frame, bg=self._BG_ELEVATED, height=1)
-        sep.pack(fill=tk.X, padx=8)
-
-        self._disk_rows[dev] = {
-            'frame': disk_entry_frame,
+        item = self.disk_canvas.create_window(8, 0, window=outer, anchor='nw', state='hidden')
+        return {
+            'item': item,
+            'dev': None,
+            'rendered': None,
+            'progress': None,
             'outer': outer,
-            'sep': sep,
+            'frame': disk_entry_frame,
+            'top': top,
+            'marker': marker,
             'cb': cb,
-            'var': var,
+            'text_col': text_col,
             'id_label': id_label,
             'details_label': details_label,
+            'progress_frame': progress_frame,
+            'progress_bar': progress_bar,
+            'progress_label': progress_label,
             'badge': badge,
-            'top': top,
-        }
-        self._disk_row_cache[dev] = {
-            'id_text': id_text,
-            'details_text': details_text,
-            'text_color': text_color,
         }
 
+    def _render_row_view(self, view: dict, dev: str) -> None:
+        """Dessine la ligne `dev` dans une vue ; seuls les widgets dont l'affichage change sont touchés."""
+        row = self._disk_rows[dev]
+        key = (dev, row['id_text'], row['details_text'], row['text_color'], row['erasing'], row['job'])
+        if view['rendered'] != key:
+            view['rendered'] = key
+            is_erasing = row['erasing']
+            is_ssd_disk = '(SSD)' in row['id_text']
+            is_active_disk = row['text_color'] == 'red'
+
+            card_bg = self._SURFACE if not is_erasing else self._SURFACE2
+            for name in ('frame', 'top', 'text_col', 'id_label', 'details_label',
+                         'progress_frame', 'progress_label'):
+                view[name].configure(bg=card_bg)
+
+            marker_color = self._DANGER if is_active_disk else self._WARNING if is_erasing else self._SSD_COLOR if is_ssd_disk else self._HDD_COLOR
+            view['marker'].configure(bg=marker_color)
+            view['cb'].configure(
+                variable=row['var'],
+                bg=card_bg,
+                activebackground=card_bg,
+                fg=self._map_disk_color(row['text_color'], is_erasing),
+                state='disabled' if is_erasing else 'normal',
+            )
+            view['id_label'].configure(text=row['id_text'])
+            view['details_label'].configure(text=row['details_text'])
+
+            if is_active_disk:
+                view['badge'].configure(text='⚠ SYSTÈME', bg=self._DANGER, fg='#ffffff')
+            elif row['job'] == JOB_QUEUED:
+                view['badge'].configure(text='⏳ EN ATTENTE', bg=self._ACCENT2, fg='#08131d')
+            elif is_erasing:
+                view['badge'].configure(text='⚙ EN COURS', bg=self._WARNING, fg='#1a1a1a')
+            elif row['job'] == JOB_DONE:
+                view['badge'].configure(text='✔ EFFACÉ', bg=self._SUCCESS, fg='#08131d')
+            elif row['job'] == JOB_FAILED:
+                view['badge'].configure(text='✖ ÉCHEC', bg=self._DANGER, fg='#ffffff')
+            elif is_ssd_disk:
+                view['badge'].configure(text='◈ SSD', bg=self._SSD_COLOR, fg='#08131d')
+            else:
+                view['badge'].configure(text='◉ HDD', bg=self._HDD_COLOR, fg='#08131d')
+            view['progress'] = False    # force le dessin de la progression ci-dessous
+
+        progress = row['progress']
+        if view['progress'] == progress:
+            return
+        view['progress'] = progress
+        if progress is None:
+            view['progress_frame'].pack_forget()
+            return
+        value, text = progress
+        view['progress_bar'].configure(value=value)
+        view['progress_label'].configure(text=text)
+        if not view['progress_frame'].winfo_manager():
+            view['progress_frame'].pack(anchor='w', pady=(6, 0))
+
+    def _sync_row_views(self) -> None:
+        """
+        Associe les vues aux lignes visibles du canevas. Une vue qui reste
+        visible garde son disque ; seules les vues sorties de l'écran sont
+        réaffectées. Le nombre de widgets dépend de la hauteur de la liste,
+        pas du nombre de disques.
+        """
+        canvas = self.disk_canvas
+        row_height = self._DISK_ROW_HEIGHT
+        first = max(0, int(canvas.canvasy(0) // row_height))
+        count = max(canvas.winfo_height(), row_height) // row_height + 2
+        visible = self._disk_order[first:first + count]
+
+        kept = {dev: view for dev, view in self._row_view_by_dev.items() if dev in visible}
+        free = [view for view in self._row_views if view['dev'] not in kept]
+        while len(kept) + len(free) < len(visible):
+            view = self._create_row_view()
+            self._row_views.append(view)
+            free.append(view)
+
+        width = max(canvas.winfo_width() - 16, 1)
+        self._row_view_by_dev = {}
+        for index, dev in enumerate(visible, first):
+            view = kept.get(dev) or free.pop()
+            view['dev'] = dev
+            canvas.coords(view['item'], 8, index * row_height + 5)
+            canvas.itemconfigure(view['item'], state='normal', width=width)
+            self._render_row_view(view, dev)
+            self._row_view_by_dev[dev] = view
+        for view in free:
+            if view['dev'] is not None:
+                view['dev'] = None
+                canvas.itemconfigure(view['item'], state='hidden')
+
+    def _on_disk_scroll(self, first, last) -> None:
+        self._disk_scrollbar.set(first, last)
+        self._sync_row_views()
+
+    def _layout_disk_rows(self, devices: List[str]) -> None:
+        """Ordre d'affichage des disques : seule la hauteur de défilement est recalculée."""
+        self._disk_order = list(devices)
+        self.disk_canvas.configure(scrollregion=(0, 0, 0, len(self._disk_order) * self._DISK_ROW_HEIGHT))
+        self._sync_row_views()
+
+    def _refresh_row_view(self, dev: str) -> None:
+        view = self._row_view_by_dev.get(dev)
+        if view is not None:
+            self._render_row_view(view, dev)
+
+    def _create_disk_row(self, disk: dict, active_physical_drives: set) -> None:
+        """Nouvelle ligne : état seulement, les widgets sont attribués à l'affichage."""
+        dev = disk['device']
+        var = tk.BooleanVar(value=dev in self._erasing_devs)
+        self.disk_vars[dev] = var
+        self._disk_rows[dev] = {'var': var, 'progress': None}
+        self._update_disk_row(dev, disk, active_physical_drives)
+        self._render_row_progress(dev)
+
     def _update_disk_row(self, dev: str, disk: dict, active_physical_drives: set) -> None:
         id_text, details_text, text_color, _ = self._build_disk_label(disk, active_physical_drives)
         is_erasing = dev in self._erasing_devs
-        display_color = self._map_disk_color(text_color, is_erasing)
-        is_ssd_disk = '(SSD)' in id_text
-        is_active_disk = text_color == 'red'
         row = self._disk_rows[dev]
-        cache = self._disk_row_cache.get(dev, {})
-
-        card_bg = self._SURFACE if not is_erasing else self._SURFACE2
-        row['frame'].configure(bg=card_bg)
-        row['top'].configure(bg=card_bg)
-        row['id_label'].configure(bg=card_bg)
-        row['details_label'].configure(bg=card_bg)
-        row['cb'].configure(bg=card_bg, activebackground=card_bg, fg=display_color)
-
-        if cache.get('id_text') != id_text or cache.get('text_color') != text_color:
-            row['id_label'].configure(text=id_text)
-        if cache.get('details_text') != details_text:
-            row['details_label'].configure(text=details_text)
-
-        var = row['var']
-        cb = row['cb']
         if is_erasing:
-            var.set(True)
-            cb.configure(state='disabled')
-        else:
-            cb.configure(state='normal')
-
-        if is_active_disk:
-            row['badge'].configure(text='⚠ SYSTÈME', bg=self._DANGER, fg='#ffffff')
-        elif is_erasing:
-            row['badge'].configure(text='⚙ EN COURS', bg=self._WARNING, fg='#1a1a1a')
-        elif is_ssd_disk:
-            row['badge'].configure(text='◈ SSD', bg=self._SSD_COLOR, fg='#08131d')
-        else:
-            row['badge'].configure(text='◉ HDD', bg=self._HDD_COLOR, fg='#08131d')
-
-        self._disk_row_cache[dev] = {
-            'id_text': id_text,
-            'details_text': details_text,
-            'text_color': text_color,
-        }
-        self.disk_vars[dev] = var
+            row['var'].set(True)
+        row.update(
+            id_text=id_text,
+            details_text=details_text,
+            text_color=text_color,
+            erasing=is_erasing,
+            job=self._job_states.get(dev),
+        )
+        self._refresh_row_view(dev)
 
     def _remove_disk_row(self, dev: str) -> None:
-        row = self._disk_rows.pop(dev, None)
-        if row:
-            row['sep'].destroy()
-            try:
-                row['outer'].destroy()
-            except Exception:
-                pass
-        self._disk_row_cache.pop(dev, None)
+        self._disk_rows.pop(dev, None)
         self.disk_vars.pop(dev, None)
 
     def _show_no_disk_message(self) -> None:
         if self._no_disk_label is None or not self._no_disk_label.winfo_exists():
             self._no_disk_label = tk.Label(
-                self.scrollable_disk_frame,
+                self.disk_canvas,
                 text="Aucun disque détecté",
                 bg=self._BG_ELEVATED,
                 fg=self._TEXT_DIM,
                 font=("Segoe UI", 10),
             )
-            self._no_disk_label.pack(pady=20)
+            self._no_disk_label.place(relx=0.5, y=20, anchor='n')
 
     def _hide_no_disk_message(self) -> None:
         if self._no_disk_label is not None:
@@ -742,41 +894,31 @@ class DiskEraserGUI:
                 self._no_disk_label.destroy()
             except Exception:
                 pass
-            self._no_disk_label = None
+        self._no_disk_label = None
 
     def refresh_disks(self) -> None:
-        try:
-            new_disks = get_disk_list()
-        except (CalledProcessError, SubprocessError, FileNotFoundError, IOError, OSError) as e:
-            error_msg = f"Erreur lors de la récupération des disques : {str(e)}"
+        """Demande une relecture de l'inventaire (non bloquant, depuis n'importe quel thread)."""
+        self._inventory.request()
+
+    def _on_inventory(self, snapshot, delta) -> None:
+        """Appelé par le thread d'inventaire : délègue au thread principal."""
+        self.root.after(0, self._apply_inventory, snapshot, delta)
+
+    def _apply_inventory(self, snapshot, delta) -> None:
+        """Applique un instantané d'inventaire : seules les lignes concernées sont touchées."""
+        for error_msg in snapshot.errors:
             self.update_gui_log(error_msg)
             log_error(error_msg)
-            new_disks = []
 
-        try:
-            active_base_disks = get_active_disk()
-        except Exception as e:
-            self.update_gui_log(f"Erreur lors de la détection du disque actif : {str(e)}")
-            active_base_disks = None
-
-        active_physical_drives = set(active_base_disks) if active_base_disks else set()
+        new_disks = list(snapshot.disks)
+        active_physical_drives = set(snapshot.active)
 
         if active_physical_drives and not self.active_drive_logged:
             log_info(f"Active physical devices: {active_physical_drives}")
             self.active_drive_logged = True
 
-        filtered_disks = []
-        for disk in new_disks:
-            device_name = disk["device"].replace("/dev/", "")
-            try:
-                base_disk = get_base_disk(device_name)
-                if base_disk in active_physical_drives:
-                    continue
-            except Exception:
-                pass
-            filtered_disks.append(disk)
-
-        new_disks = filtered_disks
+        # Le disque système n'est jamais proposé à l'effacement
+        new_disks = [disk for disk in new_disks if not disk.get("active", False)]
         self.disclaimer_var.set("")
 
         if new_disks:
@@ -794,11 +936,16 @@ class DiskEraserGUI:
 
         new_disk_map = {disk["device"]: disk for disk in new_disks}
 
+        changed = set(delta.updated)
         for dev in kept:
-            self._update_disk_row(dev, new_disk_map[dev], active_physical_drives)
+            # Ligne inchangée sauf si l'inventaire ou l'état d'effacement a bougé
+            if dev in changed or self._disk_rows[dev]['erasing'] != (dev in self._erasing_devs) \
+                    or self._disk_rows[dev]['job'] != self._job_states.get(dev):
+                self._update_disk_row(dev, new_disk_map[dev], active_physical_drives)
 
         for dev in added:
             self._create_disk_row(new_disk_map[dev], active_physical_drives)
+        self._layout_disk_rows([disk['device'] for disk in new_disks])
 
         if not new_disks:
             self._show_no_disk_message()
@@ -807,14 +954,7 @@ class DiskEraserGUI:
             self._disk_count_var.set("0 disque")
             return
 
-        has_ssd = False
-        for disk in new_disks:
-            try:
-                if is_ssd(disk["device"].replace("/dev/", "")):
-                    has_ssd = True
-                    break
-            except Exception:
-                pass
+        has_ssd = any(not disk.get('rotational', True) for disk in new_disks)
 
         self.ssd_disclaimer_var.set(
             "SSD détecté. L’effacement multi-passes peut user le support et n’est pas le meilleur choix. "
@@ -834,6 +974,11 @@ class DiskEraserGUI:
                 child.configure(state='normal' if method == 'crypto' else 'disabled')
             except tk.TclError:
                 pass
+        for child in self.verify_frame.winfo_children():
+            try:
+                child.configure(state='disabled' if method == 'crypto' else 'normal')
+            except tk.TclError:
+                pass
 
     def _update_label_options(self) -> None:
         state = 'normal' if self.label_mode_var.get() == 'custom' else 'disabled'
@@ -885,6 +1030,7 @@ class DiskEraserGUI:
         self._progress_phase_var.set('Formatage')
         self._progress_detail_var.set('Préparation des tâches de formatage')
         self._progress_stats_var.set(f"{len(selected_disks)} disque{'s' if len(selected_disks) > 1 else ''}")
+        self._reset_disk_progress(selected_disks)
         self.update_progress(0)
         disk_labels = self._resolve_labels(selected_disks)
         try:
@@ -920,11 +1066,12 @@ class DiskEraserGUI:
                     try:
                         future.result()
                         completed_disks += 1
-                        pct = (completed_disks / total_disks) * 100
-                        self.update_progress(pct)
-                        self._progress_detail_var.set(f"Formatage terminé pour {disk.replace('/dev/', '')}")
-                        self._progress_stats_var.set(f"{completed_disks}/{total_disks} terminé{'s' if completed_disks > 1 else ''}")
-                        self._set_status(f"Formatage : {completed_disks}/{total_disks} terminé", 'busy')
+                        self.update_individual_progress(disk, 100)
+                        self._post_milestone(
+                            f"Formatage : {completed_disks}/{total_disks} terminé",
+                            detail=f"Formatage terminé pour {disk.replace('/dev/', '')}",
+                            stats=f"{completed_disks}/{total_disks} terminé{'s' if completed_disks > 1 else ''}",
+                        )
                     except Exception as e:
                         error_msg = f"Erreur lors du formatage du disque {disk} : {str(e)}"
                         self.update_gui_log(error_msg)
@@ -939,6 +1086,8 @@ class DiskEraserGUI:
 
     def _on_format_complete(self) -> None:
         """Appelé sur le thread principal à la fin du formatage."""
+        self._apply_progress()
+        self._reset_disk_progress()
         self._set_status('Formatage terminé', 'idle')
         self._progress_phase_var.set('Terminé')
         self._progress_detail_var.set('Opération de formatage terminée')
@@ -952,18 +1101,21 @@ class DiskEraserGUI:
         disk_name = disk.replace('/dev/', '')
         try:
             disk_id = get_disk_serial(disk_name)
-            self._set_status(f"Formatage de {disk_id}…", 'busy')
-            self._progress_detail_var.set(f"Formatage de {disk_id}")
+            self._post_milestone(f"Formatage de {disk_id}…", detail=f"Formatage de {disk_id}")
             log_info(f"Formatting {disk_id} as {fs_choice}")
         except Exception as e:
             self.update_gui_log(f"Erreur lors de la récupération du numéro de série : {str(e)}")
-            self._set_status(f"Formatage de {disk_name}…", 'busy')
-            self._progress_detail_var.set(f"Formatage de {disk_name}")
+            self._post_milestone(f"Formatage de {disk_name}…", detail=f"Formatage de {disk_name}")
             log_info(f"Formatting {disk_name} as {fs_choice}")
+        tracker = ProgressTracker(disk_name, lambda event, d=disk: self.update_individual_progress(d, event), 'format')
         try:
-            partition_disk(disk_name, partition_table=partition_table)
+            tracker.stage_started('partition')
+            partition_disk(disk_name, partition_table=partition_table, fs_choice=fs_choice)
+            tracker.stage_done('partition')
             self.update_gui_log(f"Partitionnement de {disk_name} effectué ({partition_table.upper()})")
+            tracker.stage_started('format')
             format_disk(disk_name, fs_choice, label=label)
+            tracker.stage_done('format')
             self.update_gui_log(f"{disk_name} formaté avec succès en {fs_choice}")
             log_info(f"Successfully formatted {disk_name} as {fs_choice}")
         except (CalledProcessError, FileNotFoundError, PermissionError, IOError, OSError,
@@ -1253,6 +1405,66 @@ class DiskEraserGUI:
             self.update_gui_log(f"Erreur lors du basculement en plein écran : {str(e)}")
             log_error(f"Erreur lors du basculement en plein écran : {str(e)}")
 
+    def _plan_batch(self, selected_disks, passes: int, erase_method: str, on_planned) -> None:
+        """
+        Ordonne le lot du plus long au plus court et résume la fin estimée.
+        Les sondes de lecture (plusieurs secondes par modèle inconnu) tournent
+        sur un thread : on_planned(disques, résumé, débits) est rappelé sur le
+        thread principal, débits étant le débit mesuré de chaque disque.
+        """
+        verify = 'none' if erase_method == 'crypto' else self.verify_var.get()
+        self._planning = True
+        self._set_status('Estimation des durées…', 'busy')
+
+        def run():
+            try:
+                plans, makespan = plan_batch(selected_disks, passes, erase_method, verify)
+            except Exception as e:
+                log_error(f"Estimation du lot impossible : {e}")
+                self.root.after(0, self._on_batch_planned, on_planned, list(selected_disks), '', {})
+                return
+            finish = time.strftime('%a %H:%M', time.localtime(time.time() + makespan))
+            lines = [f"{p.disk.replace('/dev/', '')} : {format_duration(p.duration)} ({p.rate / 1e6:.0f} Mo/s, {p.source})"
+                     for p in plans]
+            summary = f"Fin estimée : {finish} (durée {format_duration(makespan)})\n" + '\n'.join(lines)
+            self.update_gui_log(summary)
+            self.root.after(0, self._on_batch_planned, on_planned, [p.disk for p in plans], summary,
+                            {p.disk: p.rate for p in plans})
+
+        try:
+            threading.Thread(target=run, name='batch-planner', daemon=True).start()
+        except (RuntimeError, OSError) as e:
+            log_error(f"Estimation du lot impossible : {e}")
+            self._on_batch_planned(on_planned, list(selected_disks), '', {})
+
+    def _on_batch_planned(self, on_planned, disks, summary: str, rates: Dict[str, float]) -> None:
+        self._planning = False
+        if self._erasing_devs:
+            self._set_status('Effacement en cours…', 'busy')
+        else:
+            self._set_status('Prêt', 'idle')
+        on_planned(disks, summary, rates)
+
+    def _ask_resume(self, selected_disks: List[str], passes: int) -> set:
+        """Propose de reprendre chaque écrasement interrompu (coupure, plantage)."""
+        resume_disks = set()
+        for disk in selected_disks:
+            try:
+                found = find_checkpoint(disk.replace('/dev/', ''), passes)
+            except Exception:
+                found = None
+            if not found:
+                continue
+            disk_id, summary = found
+            if messagebox.askyesno(
+                'Reprendre l’effacement',
+                f"Un effacement interrompu de {disk_id} a été trouvé :\n\n{summary}\n\n"
+                'Reprendre au dernier point de reprise plutôt que de tout réécrire ?',
+            ):
+                resume_disks.add(disk)
+                self.update_gui_log(f"Reprise de l’effacement de {disk_id} : {summary}")
+        return resume_disks
+
     def _resolve_labels(self, selected_disks: List[str]) -> Dict[str, str]:
         from utils import get_disk_label as _get_label
         mode = self.label_mode_var.get()
@@ -1278,7 +1490,11 @@ class DiskEraserGUI:
         return disk_labels
 
     def start_erasure(self) -> None:
-        selected_disks = [disk for disk, var in self.disk_vars.items() if var.get()]
+        if self._planning:
+            return
+        # Les disques déjà en file (cases cochées et grisées) ne sont pas soumis à nouveau
+        selected_disks = [disk for disk, var in self.disk_vars.items()
+                          if var.get() and disk not in self._erasing_devs]
         if not selected_disks:
             messagebox.showwarning('Avertissement', 'Aucun disque sélectionné.')
             return
@@ -1322,6 +1538,27 @@ class DiskEraserGUI:
             ):
                 return
 
+        passes = 1
+        if erase_method == 'overwrite':
+            try:
+                passes = int(self.passes_var.get())
+                if passes < 1:
+                    messagebox.showerror('Erreur', 'Le nombre de passes doit être supérieur ou égal à 1.')
+                    return
+            except (ValueError, OverflowError):
+                messagebox.showerror('Erreur', 'Le nombre de passes doit être un entier valide.')
+                return
+
+        # Ordre du plus long au plus court, fin estimée affichée avant confirmation
+        self._plan_batch(
+            selected_disks, passes, erase_method,
+            lambda disks, summary, rates: self._confirm_erasure(disks, summary, passes, erase_method, rates),
+        )
+
+    def _confirm_erasure(self, selected_disks: List[str], plan_summary: str, passes: int,
+                         erase_method: str, rates: Dict[str, float] = None) -> None:
+        """Suite de start_erasure une fois le lot estimé (thread principal)."""
+
         disk_identifiers = []
         for disk in selected_disks:
             disk_name = disk.replace('/dev/', '')
@@ -1333,6 +1570,8 @@ class DiskEraserGUI:
             fs_choice = self.filesystem_var.get()
             if erase_method == 'crypto':
                 method_description = f"effacement cryptographique avec remplissage {self.crypto_fill_var.get()}"
+            elif erase_method == 'offload':
+                method_description = "effacement matériel (déchargement noyau)"
             else:
                 method_description = f"écrasement standard en {self.passes_var.get()} passes"
             try:
@@ -1342,114 +1581,135 @@ class DiskEraserGUI:
                 log_error(f"Erreur lors de la journalisation de l’opération pour {disk_identifier} : {str(e)}")
 
         disk_list = '\n'.join(disk_identifiers)
-        method_info = (
-            f"avec effacement cryptographique et remplissage {self.crypto_fill_var.get()}"
-            if erase_method == 'crypto'
-            else f"avec écrasement en {self.passes_var.get()} passe(s)"
-        )
+        if erase_method == 'crypto':
+            method_info = f"avec effacement cryptographique et remplissage {self.crypto_fill_var.get()}"
+        elif erase_method == 'offload':
+            method_info = "avec effacement matériel (déchargement noyau)"
+        else:
+            method_info = f"avec écrasement en {self.passes_var.get()} passe(s)"
         if not messagebox.askyesno(
             'Confirmer l’effacement',
             f"Attention : vous êtes sur le point d’effacer de manière sécurisée les disques suivants {method_info} :\n\n{disk_list}\n\n"
+            f"{plan_summary}\n\n"
             'Cette opération est irréversible et toutes les données seront perdues.\n\n'
             'Voulez-vous continuer ?',
         ):
             return
 
-        passes = 1
-        if erase_method == 'overwrite':
-            try:
-                passes = int(self.passes_var.get())
-                if passes < 1:
-                    messagebox.showerror('Erreur', 'Le nombre de passes doit être supérieur ou égal à 1.')
-                    return
-            except (ValueError, OverflowError):
-                messagebox.showerror('Erreur', 'Le nombre de passes doit être un entier valide.')
-                return
+        resume = self._ask_resume(selected_disks, passes) if erase_method == 'overwrite' else set()
+
+        if not self._erasing_devs:
+            # Aucun effacement en cours : nouveau lot
+            self._reset_disk_progress(selected_disks)
+            self._job_states = {}
+            self._batch_total = self._batch_done = 0
+            self._progress_phase_var.set('Effacement en cours')
+            self._progress_detail_var.set('Préparation des tâches')
+            self._set_status("Préparation de l’effacement…", 'busy')
+            self.update_progress(0)
+        else:
+            # Lot en cours : les disques s’y ajoutent sans attendre sa fin
+            self._add_disk_progress(selected_disks)
 
         disk_labels = self._resolve_labels(selected_disks)
-        self._erasing_devs = set(selected_disks)
-        self.disk_progress = {disk: 0.0 for disk in selected_disks}
-        self._progress_phase_var.set('Effacement en cours')
-        self._progress_detail_var.set('Initialisation des tâches')
-        self._progress_stats_var.set(f"0/{len(selected_disks)} terminé")
-        self.update_progress(0)
-        self._set_status('Effacement en cours…', 'busy')
-        self.refresh_disks()
-        try:
-            threading.Thread(
-                target=self.progress_state,
-                args=(selected_disks, self.filesystem_var.get(), passes, erase_method,
-                      disk_labels, self.partition_table_var.get()),
-                daemon=True,
-            ).start()
-        except (RuntimeError, OSError) as e:
-            error_msg = f"Erreur lors du démarrage du thread d’effacement : {str(e)}"
-            messagebox.showerror('Erreur de thread', error_msg)
-            self.update_gui_log(error_msg)
-            log_error(error_msg)
-            self._erasing_devs.clear()
-            self._set_status('Prêt', 'idle')
+        self._submit_erase_jobs(selected_disks, self.filesystem_var.get(), passes, erase_method,
+                                disk_labels, self.partition_table_var.get(), resume, rates)
 
-    def progress_state(self, disks: List[str], fs_choice: str, passes: int,
-                       erase_method: str, disk_labels: Dict[str, str] = None,
-                       partition_table: str = "mbr") -> None:
+    def _submit_erase_jobs(self, disks: List[str], fs_choice: str, passes: int, erase_method: str,
+                           disk_labels: Dict[str, str] = None, partition_table: str = "mbr",
+                           resume: set = frozenset(), rates: Dict[str, float] = None) -> None:
+        """
+        Confie les disques au JobScheduler (thread principal, non bloquant),
+        avec le débit mesuré de chaque disque (`rates`, voir plan_batch).
+        Les options sont figées ici : un disque encore en attente d’un
+        créneau n’est pas affecté par un changement ultérieur du formulaire.
+        """
+        crypto_fill = self.crypto_fill_var.get()
+        verify = 'none' if erase_method == 'crypto' else self.verify_var.get()
         if erase_method == 'crypto':
-            fill_method = self.crypto_fill_var.get()
-            method_str = f"effacement cryptographique avec remplissage {fill_method}"
+            method_str = f"effacement cryptographique avec remplissage {crypto_fill}"
+        elif erase_method == 'offload':
+            method_str = "effacement matériel (déchargement noyau)"
         else:
             method_str = f"écrasement standard en {passes} passe(s)"
+        if verify == 'full':
+            method_str += ", vérifié par relecture complète"
+        elif verify == 'sample':
+            method_str += ", vérifié par relecture échantillonnée"
 
-        start_msg = f"Démarrage de l’effacement sécurisé de {len(disks)} disque(s) avec {method_str}"
+        if self._erasing_devs:
+            start_msg = f"Ajout de {len(disks)} disque(s) au lot en cours avec {method_str}"
+        else:
+            start_msg = f"Démarrage de l’effacement sécurisé de {len(disks)} disque(s) avec {method_str}"
         self.update_gui_log(start_msg)
         log_info(start_msg)
         self.update_gui_log(f"Système de fichiers sélectionné : {fs_choice}")
         log_info(f"Selected filesystem: {fs_choice}")
 
-        total_disks = len(disks)
-        completed_disks = 0
+        for disk in disks:
+            try:
+                self._jobs.submit(
+                    disk, self.process_disk_wrapper, disk, fs_choice, passes, erase_method,
+                    (disk_labels or {}).get(disk), partition_table,
+                    crypto_fill=crypto_fill, verify=verify, resume=disk in resume,
+                    rate=(rates or {}).get(disk, 0.0),
+                )
+            except (ValueError, RuntimeError) as e:
+                error_msg = f"Impossible de planifier l’effacement de {disk} : {str(e)}"
+                self.update_gui_log(error_msg)
+                log_error(error_msg)
+                self.disk_progress.pop(disk, None)
+                self._render_row_progress(disk)
+                continue
+            self._erasing_devs.add(disk)
+            self._batch_total += 1
 
-        try:
-            with ThreadPoolExecutor() as executor:
-                futures = {
-                    executor.submit(
-                        self.process_disk_wrapper, disk, fs_choice, passes, erase_method,
-                        (disk_labels or {}).get(disk), partition_table,
-                    ): disk
-                    for disk in disks
-                }
-                for future in as_completed(futures):
-                    disk = futures[future]
-                    try:
-                        future.result()
-                        completed_disks += 1
-                        self.disk_progress[disk] = 100.0
-                        self._erasing_devs.discard(disk)
-                        self._recompute_global_progress()
-                        self._progress_stats_var.set(f"{completed_disks}/{total_disks} terminé{'s' if completed_disks > 1 else ''}")
-                        self._progress_detail_var.set(f"Terminé : {disk.replace('/dev/', '')}")
-                        self._set_status(f"Effacement : {completed_disks}/{total_disks} terminé", 'busy')
-                        self.refresh_disks()
-                    except Exception as e:
-                        self._erasing_devs.discard(disk)
-                        error_msg = f"Erreur lors du traitement du disque {disk} : {str(e)}"
-                        self.update_gui_log(error_msg)
-                        log_error(error_msg)
-                        self.refresh_disks()
-        except Exception as e:
-            error_msg = f"Erreur du pool de threads pendant l’effacement : {str(e)}"
-            self.update_gui_log(error_msg)
-            log_error(error_msg)
-        finally:
-            self._erasing_devs.clear()
-            self.disk_progress = {}
-            self.refresh_disks()
+        if not self._erasing_devs:
+            self._set_status('Prêt', 'idle')
+            return
+        if self._batch_done:
+            self._progress_stats_var.set(f"{self._batch_done}/{self._batch_total} terminé{'s' if self._batch_done > 1 else ''}")
+        else:
+            self._progress_stats_var.set(f"{self._batch_total} disque{'s' if self._batch_total > 1 else ''}")
+        self.refresh_disks()
 
-        log_info('Erasure process completed')
-        # ── FIX : délégation au thread principal pour garantir l'ordre log → popup ──
-        self.root.after(0, self._on_erase_complete)
+    def _on_job_state(self, job) -> None:
+        """Appelé par le thread d’un travail : délègue au thread principal."""
+        self.root.after(0, self._apply_job_state, job.disk, job.state, job.error)
+
+    def _apply_job_state(self, disk: str, state: str, error: str = "") -> None:
+        self._job_states[disk] = state
+        finished = state in (JOB_DONE, JOB_FAILED)
+        if finished:
+            self._erasing_devs.discard(disk)
+            self._batch_done += 1
+            stats = f"{self._batch_done}/{self._batch_total} terminé{'s' if self._batch_done > 1 else ''}"
+            if state == JOB_DONE:
+                detail = f"Terminé : {disk.replace('/dev/', '')}"
+            else:
+                detail = f"Échec : {disk.replace('/dev/', '')}"
+                error_msg = f"Erreur lors du traitement du disque {disk} : {error}"
+                self.update_gui_log(error_msg)
+                log_error(error_msg)
+            self._show_milestone(f"Effacement : {self._batch_done}/{self._batch_total} terminé", detail, stats)
+
+        row = self._disk_rows.get(disk)
+        if row is not None:
+            row['erasing'] = disk in self._erasing_devs
+            row['job'] = state
+            self._render_row_progress(disk)
+            self._refresh_row_view(disk)
+
+        if finished:
+            self.refresh_disks()
+            if not self._erasing_devs:
+                log_info('Erasure process completed')
+                self._on_erase_complete()
 
     def _on_erase_complete(self) -> None:
         """Appelé sur le thread principal à la fin de l'effacement."""
+        self._apply_progress()
+        self._reset_disk_progress()
         self.update_progress(100)
         self._progress_phase_var.set('Terminé')
         self._progress_detail_var.set("L'opération d'effacement est terminée")
@@ -1462,40 +1722,134 @@ class DiskEraserGUI:
 
     def process_disk_wrapper(self, disk: str, fs_choice: str, passes: int,
                              erase_method: str, label: str = None,
-                             partition_table: str = "mbr") -> None:
+                             partition_table: str = "mbr",
+                             crypto_fill: str = None, verify: str = None, resume: bool = False) -> None:
         disk_name = disk.replace('/dev/', '')
         try:
             disk_id = get_disk_serial(disk_name)
-            self._set_status(f"Effacement de {disk_id}…", 'busy')
-            self._progress_detail_var.set(f"Effacement de {disk_id}")
+            self._post_milestone(f"Effacement de {disk_id}…", detail=f"Effacement de {disk_id}")
         except Exception as e:
             self.update_gui_log(f"Erreur lors de la récupération du numéro de série : {str(e)}")
-            self._set_status(f"Effacement de {disk_name}…", 'busy')
-            self._progress_detail_var.set(f"Effacement de {disk_name}")
+            self._post_milestone(f"Effacement de {disk_name}…", detail=f"Effacement de {disk_name}")
 
         try:
             use_crypto = erase_method == 'crypto'
-            crypto_fill = self.crypto_fill_var.get() if use_crypto else 'random'
+            crypto_fill = (crypto_fill or self.crypto_fill_var.get()) if use_crypto else 'random'
             process_disk(
                 disk_name, fs_choice, passes, use_crypto, crypto_fill,
                 log_func=self.update_gui_log,
                 label=label,
                 progress_callback=lambda value, d=disk: self.update_individual_progress(d, value),
                 partition_table=partition_table,
+                use_offload=erase_method == 'offload',
+                verify='none' if use_crypto else (verify or self.verify_var.get()),
+                resume=resume,
             )
         except Exception as e:
             self.update_gui_log(f"Erreur lors du traitement de {disk_name} : {str(e)}")
             raise
 
-    def update_individual_progress(self, disk: str, value: float) -> None:
+    def update_individual_progress(self, disk: str, value) -> None:
+        """
+        value : pourcentage global du disque ou progress.ProgressEvent.
+        Appelé depuis les threads de travail : la valeur est seulement déposée
+        dans le bus, _render_progress l'affiche au prochain échantillonnage.
+        """
+        event = value if isinstance(value, ProgressEvent) else None
         try:
-            numeric = max(0.0, min(100.0, float(value)))
+            numeric = max(0.0, min(100.0, float(event.percent if event else value)))
         except (ValueError, TypeError):
             return
-        self.disk_progress[disk] = numeric
-        self._progress_detail_var.set(f"{disk.replace('/dev/', '')} — {int(numeric)} %")
+        self._progress_bus.post(disk, (numeric, event))
+
+    @classmethod
+    def _format_progress_detail(cls, disk: str, numeric: float, event: ProgressEvent = None) -> str:
+        return f"{disk.replace('/dev/', '')} — {cls._format_progress_stats(numeric, event)}"
+
+    @classmethod
+    def _format_progress_stats(cls, numeric: float, event: ProgressEvent = None) -> str:
+        """« 42 % • Écrasement (passe 2/3) • 180 Mo/s • reste 1:02:03 »."""
+        detail = f"{int(numeric)} %"
+        if event is None:
+            return detail
+        detail += f" • {cls._STAGE_LABELS.get(event.stage, event.stage)}"
+        if event.pass_count > 1:
+            detail += f" (passe {event.pass_index}/{event.pass_count})"
+        if event.rate_ewma > 0:
+            detail += f" • {event.rate_ewma / 1e6:.0f} Mo/s"
+        if event.eta is not None:
+            detail += f" • reste {format_duration(event.eta)}"
+        return detail
+
+    def _apply_progress(self) -> None:
+        """Reporte les valeurs publiées depuis le dernier échantillon (thread principal)."""
+        latest = None
+        for disk, (numeric, event) in self._progress_bus.changes().items():
+            # Publications tardives d'un lot terminé : ignorées
+            if disk in self.disk_progress:
+                self.disk_progress[disk] = numeric
+                self._progress_events[disk] = event
+                self._render_row_progress(disk)
+                latest = (disk, numeric, event)
+        if latest is None:
+            return
+        self._progress_detail_var.set(self._format_progress_detail(*latest))
         self._recompute_global_progress()
 
+    def _add_disk_progress(self, disks) -> None:
+        """Disques ajoutés à un lot en cours : leurs barres partent de zéro."""
+        for disk in disks:
+            self.disk_progress[disk] = 0.0
+            self._progress_events.pop(disk, None)
+            self._render_row_progress(disk)
+
+    def _reset_disk_progress(self, disks=()) -> None:
+        """Début (disques du lot) ou fin (aucun disque) d'un lot : barres des lignes remises à zéro."""
+        self._progress_bus.clear()
+        previous = set(self.disk_progress)
+        self.disk_progress = {disk: 0.0 for disk in disks}
+        self._progress_events = {}
+        for dev in previous | set(self.disk_progress):
+            self._render_row_progress(dev)
+
+    def _render_row_progress(self, dev: str) -> None:
+        """Barre et statistiques d'une ligne ; la vue n'est redessinée que si l'affichage change."""
+        row = self._disk_rows.get(dev)
+        if row is None:
+            return
+        state = None
+        if dev in self.disk_progress:
+            numeric = self.disk_progress[dev]
+            if self._job_states.get(dev) == JOB_QUEUED:
+                state = (0, "En attente d'un créneau")
+            else:
+                state = (int(numeric), self._format_progress_stats(numeric, self._progress_events.get(dev)))
+        if row['progress'] == state:
+            return
+        row['progress'] = state
+        self._refresh_row_view(dev)
+
+    def _render_progress(self) -> None:
+        """Échantillonne le bus tous les _PROGRESS_FRAME_MS et redessine une seule fois."""
+        try:
+            self._apply_progress()
+        except (tk.TclError, ValueError, TypeError) as e:
+            log_error(f"Erreur lors de la mise à jour de l'état de progression : {str(e)}")
+        self.root.after(self._PROGRESS_FRAME_MS, self._render_progress)
+
+    def _post_milestone(self, status: str, detail: str = None, stats: str = None) -> None:
+        """Étape marquante (début, fin d'un disque) signalée depuis un thread de travail."""
+        self.root.after(0, self._show_milestone, status, detail, stats)
+
+    def _show_milestone(self, status: str, detail: str = None, stats: str = None) -> None:
+        # Vider le bus d'abord : un échantillon en retard n'écrase pas le message
+        self._apply_progress()
+        if detail is not None:
+            self._progress_detail_var.set(detail)
+        if stats is not None:
+            self._progress_stats_var.set(stats)
+        self._set_status(status, 'busy')
+
     def _recompute_global_progress(self) -> None:
         if not self.disk_progress:
             self.update_progress(0)
@@ -1509,7 +1863,6 @@ class DiskEraserGUI:
 
             if hasattr(self, '_progress_stats_var') and 'terminé' not in self._progress_stats_var.get().lower():
                 self._progress_stats_var.set(f"Progression interne : {int(numeric)} %")
-            self.root.update_idletasks()
         except (tk.TclError, ValueError, TypeError) as e:
             self.update_gui_log(f"Erreur lors de la mise à jour de l'état de progression : {str(e)}")
             log_error(f"Erreur lors de la mise à jour de l'état de progression : {str(e)}")
@@ -1517,13 +1870,30 @@ class DiskEraserGUI:
     def update_gui_log(self, message: str) -> None:
         """
         Insertion thread-safe dans le journal GUI.
-        Peut être appelé depuis n'importe quel thread : la mise à jour est
-        toujours exécutée par la boucle principale Tkinter via root.after(0, …).
+        Peut être appelé depuis n'importe quel thread : le message est horodaté
+        et placé dans une file (deque, append atomique) ; la boucle principale
+        Tkinter la vide tous les _LOG_FLUSH_MS en une seule insertion.
         """
-        def _insert() -> None:
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        self._log_queue.append(f"[{timestamp}] {message}\n")
+
+    def _flush_gui_log(self) -> None:
+        """Vide la file du journal : une insertion groupée, puis coupe les lignes en trop."""
+        lines = []
+        try:
+            while True:
+                lines.append(self._log_queue.popleft())
+        except IndexError:
+            pass
+
+        if lines:
             try:
-                timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-                self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+                self.log_text.insert(tk.END, "".join(lines))
+                # Chaque message finit par \n : la dernière ligne du widget est vide
+                line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+                excess = line_count - self._LOG_MAX_LINES
+                if excess > 0:
+                    self.log_text.delete('1.0', f"{excess + 1}.0")
                 self.log_text.see(tk.END)
             except (tk.TclError, ValueError, TypeError, OSError) as e:
                 try:
@@ -1531,7 +1901,7 @@ class DiskEraserGUI:
                 except (IOError, OSError):
                     pass
 
-        self.root.after(0, _insert)
+        self.root.after(self._LOG_FLUSH_MS, self._flush_gui_log)
 def run_gui_mode() -> None:
     try:
         root = tk.Tk()
@@ -0,0 +1,711 @@
+"""
+io_engine.py – Moteur d'écrasement en processus (remplace shred).
+
+Le périphérique est ouvert en O_DIRECT et écrit depuis un tampon aligné
+(mmap anonyme, donc aligné sur la page) réutilisé pour tout le passage :
+aucune allocation par bloc, aucun texte à analyser. La progression est
+calculée à partir de l'offset effectivement écrit.
+
+Pour un motif constant, l'octet écrit à l'offset `o` vaut
+`tampon[o % taille_tampon]` : le tampon est rempli une fois par passage.
+
+Sur les supports non rotatifs (NVMe, SSD), le périphérique est découpé en
+bandes de LBA contiguës écrites en parallèle (os.pwritev, qui libère le
+GIL) afin de maintenir plusieurs E/S en vol ; le nombre de workers est
+dérivé de queue/nr_requests et du nombre de files matérielles blk-mq.
+
+Chaque passage aléatoire est un flux non répétitif dérivé d'une graine de
+32 octets : l'octet à l'offset absolu o est celui du flux de clé
+AES-256-CTR (clé = graine, compteur initial = o // 16), calculé par la
+libcrypto d'OpenSSL via ctypes (AES-NI, GIL relâché). Sans libcrypto, le
+bloc de STREAM_BLOCK octets d'index i vaut SHAKE-128(graine || i), plusieurs
+fois plus lent ; STREAM_VERSION, enregistré dans les points de reprise,
+distingue les deux. Le tampon est régénéré à chaque fenêtre, la suivante
+étant calculée sur un thread pendant l'écriture. La graine et l'offset
+suffisent à reconstruire n'importe quelle zone, ce qui permet de reprendre
+un passage interrompu (voir checkpoint.py) et de le vérifier par relecture.
+
+Le moteur de déchargement (offload_device) délègue l'effacement au
+contrôleur via BLKZEROOUT / BLKSECDISCARD / BLKDISCARD, par grandes plages.
+
+La vérification (verify_device) relit le périphérique en O_DIRECT par
+blocs de CHUNK_SIZE et compare chaque bloc au tampon de référence du
+dernier passage : une copie puis un memcmp (ou NumPy s'il est présent),
+sans boucle Python par octet.
+
+Le mode échantillonné (verify_samples) ne relit que des blocs répartis
+aléatoirement (plus le premier et le dernier Mio et la zone de la GPT de
+secours) : si une fraction p du disque n'avait pas été effacée, k tirages
+uniformes la manqueraient tous avec une probabilité (1 - p)^k, d'où la
+borne p < 1 - alpha^(1/k) avec une confiance 1 - alpha.
+"""
+import errno
+import hashlib
+import mmap
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from blkdev import (
+    BLKDISCARD,
+    BLKSECDISCARD,
+    BLKZEROOUT,
+    get_hw_queue_count,
+    get_nr_requests,
+    get_offload_limits,
+    is_rotational,
+    range_ioctl,
+)
+
+try:
+    import numpy as np
+except ImportError:  # comparaison bytes / memcmp
+    np = None
+
+try:
+    import ctypes
+    import ctypes.util
+
+    _libcrypto = ctypes.CDLL(ctypes.util.find_library("crypto") or "libcrypto.so.3")
+    _libcrypto.EVP_CIPHER_CTX_new.restype = ctypes.c_void_p
+    _libcrypto.EVP_CIPHER_CTX_free.argtypes = [ctypes.c_void_p]
+    _libcrypto.EVP_aes_256_ctr.restype = ctypes.c_void_p
+    _libcrypto.EVP_EncryptInit_ex.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+                                              ctypes.c_char_p, ctypes.c_char_p]
+    _libcrypto.EVP_EncryptUpdate.argtypes = [ctypes.c_void_p, ctypes.c_void_p,
+                                             ctypes.POINTER(ctypes.c_int), ctypes.c_void_p, ctypes.c_int]
+except (ImportError, OSError, AttributeError):  # flux SHAKE-128
+    _libcrypto = None
+
+CHUNK_SIZE = 16 * 1024 * 1024      # 16 Mio : taille du tampon de motif
+IO_SIZE    = CHUNK_SIZE            # taille d'une écriture en mode séquentiel
+PARALLEL_IO_SIZE = 1024 * 1024     # 1 Mio par écriture et par worker en mode parallèle
+ALIGNMENT  = 4096                  # alignement requis par O_DIRECT (≥ secteur logique)
+STRIPE_ALIGNMENT = 1024 * 1024     # bandes alignées sur 1 Mio
+MAX_WORKERS = 32
+IOS_PER_HW_QUEUE = 4
+OFFLOAD_RANGE = 1024 * 1024 * 1024  # 1 Gio par ioctl de déchargement
+CHECKPOINT_BYTES = 4 * 1024 * 1024 * 1024  # point de reprise tous les 4 Gio écrits
+SEED_SIZE = 32
+STREAM_BLOCK = 1024 * 1024          # unité du flux de secours : SHAKE-128(graine || index)
+# Définition du flux aléatoire, enregistrée dans les points de reprise
+STREAM_VERSION = "aes256ctr" if _libcrypto is not None else "shake128-1m"
+
+PATTERNS = ("random", "zero", "ones")
+VERIFY_MODES = ("none", "full", "sample")
+SAMPLE_COUNT = 1024                 # blocs aléatoires relus en mode échantillonné
+SAMPLE_BLOCK_SIZE = 1024 * 1024     # taille d'un bloc échantillon
+SAMPLE_WORKERS = 4                  # lectures en vol minimum (NCQ sur les HDD)
+GPT_BACKUP_SECTORS = 33             # en-tête + table de secours en fin de disque
+PROBE_SIZE = 64 * 1024 * 1024       # lecture séquentielle par point de sondage
+PROBE_POINTS = 3                    # début, milieu et fin du disque
+
+
+def open_device(path: str, write: bool = True, direct: bool = True) -> int:
+    """
+    Ouvre un périphérique bloc (ou un fichier image) et retourne le descripteur.
+    O_DIRECT est demandé si possible ; en cas de refus (tmpfs, certains FS),
+    l'ouverture est retentée en mode bufferisé.
+    """
+    flags = (os.O_WRONLY if write else os.O_RDONLY) | getattr(os, "O_CLOEXEC", 0)
+    if direct and hasattr(os, "O_DIRECT"):
+        try:
+            return os.open(path, flags | os.O_DIRECT)
+        except OSError as e:
+            if e.errno != errno.EINVAL:
+                raise
+    return os.open(path, flags)
+
+
+def get_size(fd: int) -> int:
+    """Retourne la taille en octets d'un périphérique ou fichier ouvert."""
+    return os.lseek(fd, 0, os.SEEK_END)
+
+
+def allocate_buffer(size: int = CHUNK_SIZE) -> mmap.mmap:
+    """Alloue un tampon anonyme aligné sur la page, multiple de ALIGNMENT."""
+    size = max(ALIGNMENT, (size // ALIGNMENT) * ALIGNMENT)
+    return mmap.mmap(-1, size)
+
+
+def stream_bytes(seed: bytes, offset: int, length: int) -> bytes:
+    """Octets [offset, offset + length) du flux aléatoire de `seed`."""
+    if length <= 0:
+        return b""
+    if _libcrypto is not None:
+        return _aes_ctr_stream(seed, offset, length)
+    first = offset // STREAM_BLOCK
+    last = (offset + length - 1) // STREAM_BLOCK
+    data = b"".join(
+        hashlib.shake_128(seed + index.to_bytes(8, "little")).digest(STREAM_BLOCK)
+        for index in range(first, last + 1)
+    )
+    skip = offset - first * STREAM_BLOCK
+    return data[skip:skip + length]
+
+
+def _aes_ctr_stream(seed: bytes, offset: int, length: int) -> bytes:
+    """Flux de clé AES-256-CTR (clé `seed`) de l'offset `offset`, chiffré sur place."""
+    skip = offset % 16
+    out = ctypes.create_string_buffer(skip + length)
+    written = ctypes.c_int()
+    ctx = _libcrypto.EVP_CIPHER_CTX_new()
+    if not ctx:
+        raise MemoryError("EVP_CIPHER_CTX_new")
+    try:
+        iv = (offset // 16 % (1 << 128)).to_bytes(16, "big")
+        if not (_libcrypto.EVP_EncryptInit_ex(ctx, _libcrypto.EVP_aes_256_ctr(), None, seed, iv)
+                and _libcrypto.EVP_EncryptUpdate(ctx, out, ctypes.byref(written), out, len(out))):
+            raise OSError(errno.EIO, "Échec du chiffrement AES-256-CTR (libcrypto)")
+    finally:
+        _libcrypto.EVP_CIPHER_CTX_free(ctx)
+    return out.raw[skip:] if skip else out.raw
+
+
+def fill_pattern(buf: mmap.mmap, pattern, seed: bytes = None, offset: int = 0) -> None:
+    """
+    Remplit le tampon avec le motif demandé.
+    pattern : "random", "zero", "ones" ou un motif en bytes répété.
+    seed : graine du motif "random" ; le tampon reçoit alors les octets du
+    flux à partir de `offset` (os.urandom si la graine est absente).
+    """
+    size = len(buf)
+    if pattern == "random":
+        data = stream_bytes(seed, offset, size) if seed else os.urandom(size)
+    elif pattern == "zero":
+        data = bytes(size)
+    elif pattern == "ones":
+        data = b"\xff" * size
+    elif isinstance(pattern, (bytes, bytearray)) and pattern:
+        data = (bytes(pattern) * (size // len(pattern) + 1))[:size]
+    else:
+        raise ValueError(f"Motif d'écrasement inconnu : {pattern!r}")
+    buf.seek(0)
+    buf.write(data)
+
+
+def get_write_workers(device: str) -> int:
+    """
+    Nombre d'écritures concurrentes à maintenir sur `device`.
+    1 pour un support rotatif (le parallélisme y provoque des déplacements
+    de tête) ; sinon IOS_PER_HW_QUEUE par file matérielle, borné par
+    queue/nr_requests et MAX_WORKERS.
+    """
+    if is_rotational(device):
+        return 1
+    depth = get_hw_queue_count(device) * IOS_PER_HW_QUEUE
+    return max(1, min(MAX_WORKERS, get_nr_requests(device), depth))
+
+
+def stripe_ranges(size: int, count: int, align: int = STRIPE_ALIGNMENT) -> list:
+    """
+    Découpe [0, size) en `count` bandes contiguës [début, fin) alignées sur
+    `align` ; la dernière bande absorbe le reste.
+    """
+    count = max(1, count)
+    step = (size // count // align) * align
+    if step == 0:
+        return [(0, size)]
+    bounds = [i * step for i in range(count)] + [size]
+    return [(bounds[i], bounds[i + 1]) for i in range(count)]
+
+
+def write_range(fd: int, buf: mmap.mmap, start: int, end: int, progress=None,
+                io_size: int = IO_SIZE, seed: bytes = None) -> int:
+    """
+    Écrit le tampon sur [start, end) avec os.pwritev, sans copie intermédiaire.
+    progress(octets) est appelé après chaque écriture avec le nombre
+    d'octets qu'elle vient d'écrire.
+    seed : passage aléatoire ; `buf` (propre à l'appel) reçoit la fenêtre
+    du flux couvrant l'offset courant, la fenêtre suivante étant générée
+    sur un thread pendant l'écriture.
+    Retourne le nombre d'octets écrits.
+    """
+    view = memoryview(buf)
+    buf_len = len(buf)
+    offset = start
+    window = None
+    upcoming = None
+    prefetch = ThreadPoolExecutor(max_workers=1) if seed is not None else None
+    try:
+        while offset < end:
+            if prefetch is not None and offset - offset % buf_len != window:
+                window = offset - offset % buf_len
+                if upcoming is not None and upcoming[0] == window:
+                    view[:] = upcoming[1].result()
+                else:
+                    view[:] = stream_bytes(seed, window, buf_len)
+                upcoming = None
+                if window + buf_len < end:
+                    upcoming = (window + buf_len,
+                                prefetch.submit(stream_bytes, seed, window + buf_len, buf_len))
+            pos = offset % buf_len
+            n = min(buf_len - pos, end - offset, io_size)
+            written = os.pwritev(fd, [view[pos:pos + n]], offset)
+            if written <= 0:
+                raise OSError(errno.EIO, f"Écriture nulle à l'offset {offset}")
+            offset += written
+            if progress:
+                progress(written)
+    finally:
+        view.release()
+        if prefetch is not None:
+            prefetch.shutdown(wait=True, cancel_futures=True)
+    return offset - start
+
+
+def overwrite_device(path: str, patterns, chunk_size: int = CHUNK_SIZE,
+                     progress=None, direct: bool = True, workers: int = 1,
+                     keep_reference: bool = False, resume: dict = None,
+                     checkpoint=None) -> dict:
+    """
+    Écrase entièrement `path`, un passage par motif de `patterns`.
+
+    workers > 1 : chaque passage est découpé en `workers` bandes écrites en
+    parallèle depuis le même tampon (partagé en lecture seule).
+    progress(octets_passage, total, index_passage, nb_passages) est appelé
+    à chaque bloc écrit (index_passage commence à 1).
+
+    checkpoint(état) est appelé tous les CHECKPOINT_BYTES écrits, après un
+    fsync, puis à la fin de chaque passage ; `état` est un dict sérialisable
+    en JSON ({"size", "pass_index", "pass_count", "seeds", "stripes",
+    "stream"}) que l'on peut repasser en `resume` pour reprendre l'écriture
+    où elle s'était arrêtée (il est ignoré si la taille, le nombre de
+    passages ou la définition du flux aléatoire diffère).
+
+    Retourne {"size", "bytes_written", "elapsed", "throughput", "workers",
+    "resumed"}, plus, si keep_reference est vrai, "reference" (tampon d'un
+    dernier passage constant) et "seed" (graine d'un dernier passage
+    aléatoire), à passer à verify_device.
+    """
+    patterns = list(patterns)
+    workers = max(1, int(workers))
+    fd = open_device(path, write=True, direct=direct)
+    buf = allocate_buffer(chunk_size)
+    start_time = time.monotonic()
+    written = 0
+    reference = None
+    reference_seed = None
+    try:
+        size = get_size(fd)
+        if (resume and resume.get("size") == size and resume.get("pass_count") == len(patterns)
+                and resume.get("stream") == STREAM_VERSION):
+            state = resume
+        else:
+            state = {
+                "size": size,
+                "pass_index": 1,
+                "pass_count": len(patterns),
+                "seeds": [os.urandom(SEED_SIZE).hex() for _ in patterns],
+                "stripes": [[start, end, start] for start, end in stripe_ranges(size, workers)],
+                "stream": STREAM_VERSION,
+            }
+        resumed = state is resume
+        for index in range(state["pass_index"], len(patterns) + 1):
+            state["pass_index"] = index
+            seed = bytes.fromhex(state["seeds"][index - 1])
+            if patterns[index - 1] == "random":
+                written += _write_pass(fd, buf, state, progress, checkpoint, seed)
+            else:
+                fill_pattern(buf, patterns[index - 1])
+                written += _write_pass(fd, buf, state, progress, checkpoint)
+            os.fsync(fd)
+            for stripe in state["stripes"]:
+                stripe[2] = stripe[0]
+            state["pass_index"] = index + 1
+            if checkpoint:
+                checkpoint(state)
+        if keep_reference:
+            # Reconstruit depuis l'état : aucun passage n'a pu être écrit si
+            # la reprise a lieu après la fin du dernier
+            if patterns[-1] == "random":
+                reference_seed = bytes.fromhex(state["seeds"][-1])
+            else:
+                fill_pattern(buf, patterns[-1])
+                reference = bytes(buf)
+    finally:
+        buf.close()
+        os.close(fd)
+
+    elapsed = max(time.monotonic() - start_time, 1e-9)
+    stats = {
+        "size": size,
+        "bytes_written": written,
+        "elapsed": elapsed,
+        "throughput": written / elapsed,
+        "workers": len(state["stripes"]),
+        "resumed": resumed,
+    }
+    if keep_reference:
+        stats["reference"] = reference
+        stats["seed"] = reference_seed
+    return stats
+
+
+def _write_pass(fd: int, buf: mmap.mmap, state: dict, progress=None, checkpoint=None,
+                seed: bytes = None) -> int:
+    """
+    Écrit le passage state["pass_index"], séquentiellement ou par bandes
+    parallèles, chaque bande reprenant à son offset enregistré. Avec `seed`,
+    le passage est le flux aléatoire de la graine et chaque bande parallèle
+    génère le sien dans son propre tampon.
+    """
+    size, index, count = state["size"], state["pass_index"], state["pass_count"]
+    stripes = state["stripes"]
+    lock = threading.Lock()
+    save_lock = threading.Lock()
+    done = [sum(offset - start for start, _, offset in stripes)]
+    pending = [0]
+
+    def save() -> None:
+        # Instantané des offsets, puis fsync : tout ce qu'il décrit est alors
+        # sur le support avant d'être enregistré comme point de reprise
+        with save_lock:
+            with lock:
+                snapshot = dict(state, stripes=[list(stripe) for stripe in stripes])
+            os.fsync(fd)
+            checkpoint(snapshot)
+
+    def make_on_write(stripe: list):
+        def on_write(n: int) -> None:
+            with lock:
+                stripe[2] += n
+                done[0] += n
+                current = done[0]
+                pending[0] += n
+                due = checkpoint is not None and pending[0] >= CHECKPOINT_BYTES
+                if due:
+                    pending[0] = 0
+            if due:
+                save()
+            if progress:
+                progress(current, size, index, count)
+        return on_write
+
+    if progress:
+        progress(done[0], size, index, count)
+
+    if len(stripes) == 1:
+        stripe = stripes[0]
+        return write_range(fd, buf, stripe[2], stripe[1], make_on_write(stripe), seed=seed)
+
+    buffers = [allocate_buffer(PARALLEL_IO_SIZE) if seed is not None else buf for _ in stripes]
+    try:
+        with ThreadPoolExecutor(max_workers=len(stripes)) as executor:
+            futures = [
+                executor.submit(write_range, fd, stripe_buf, stripe[2], stripe[1], make_on_write(stripe),
+                                PARALLEL_IO_SIZE, seed)
+                for stripe, stripe_buf in zip(stripes, buffers)
+            ]
+            return sum(f.result() for f in futures)
+    finally:
+        if seed is not None:
+            for stripe_buf in buffers:
+                stripe_buf.close()
+
+
+# ── Vérification par relecture ────────────────────────────────────────────────
+
+def blocks_equal(data: memoryview, expected: bytes) -> bool:
+    """Compare un bloc relu à la référence (NumPy si disponible, sinon memcmp)."""
+    if np is not None:
+        return np.array_equal(np.frombuffer(data, dtype=np.uint8),
+                              np.frombuffer(expected, dtype=np.uint8))
+    return data.tobytes() == expected
+
+
+def _first_mismatch(data: memoryview, expected: bytes) -> int:
+    """Index du premier secteur (ALIGNMENT) différent dans un bloc non conforme."""
+    for pos in range(0, len(expected), ALIGNMENT):
+        if data[pos:pos + ALIGNMENT].tobytes() != expected[pos:pos + ALIGNMENT]:
+            return pos
+    return 0
+
+
+def verify_range(fd: int, reference: bytes, start: int, end: int, progress=None,
+                 io_size: int = IO_SIZE, stop: Optional[threading.Event] = None,
+                 seed: bytes = None) -> Optional[int]:
+    """
+    Relit [start, end) et compare chaque bloc à `reference` (l'octet à
+    l'offset o doit valoir reference[o % len(reference)]) ou, avec `seed`,
+    au flux aléatoire de la graine (`reference` est alors ignoré).
+    progress(octets) est appelé après chaque lecture.
+    Retourne l'offset (aligné sur ALIGNMENT) de la première différence, ou None.
+    """
+    ref_len = len(reference) if seed is None else io_size
+    buf = allocate_buffer(min(io_size, ref_len))
+    view = memoryview(buf)
+    offset = start
+    try:
+        while offset < end:
+            if stop is not None and stop.is_set():
+                return None
+            pos = offset % ref_len
+            n = min(ref_len - pos, end - offset, len(buf))
+            read = os.preadv(fd, [view[:n]], offset)
+            if read <= 0:
+                raise OSError(errno.EIO, f"Lecture nulle à l'offset {offset}")
+            if seed is None:
+                expected = reference[pos:pos + read]
+            else:
+                expected = stream_bytes(seed, offset, read)
+            if not blocks_equal(view[:read], expected):
+                return offset + _first_mismatch(view[:read], expected)
+            offset += read
+            if progress:
+                progress(read)
+    finally:
+        view.release()
+        buf.close()
+    return None
+
+
+def verify_device(path: str, reference: bytes, progress=None, direct: bool = True,
+                  workers: int = 1, seed: bytes = None) -> dict:
+    """
+    Relit entièrement `path` et le compare à `reference` (ou au flux
+    aléatoire de `seed`, voir verify_range), par bandes
+    parallèles si workers > 1 (arrêt de toutes les bandes à la première
+    différence). progress(octets_lus, total) est appelé à chaque bloc.
+    Retourne {"size", "bytes_read", "elapsed", "throughput", "mismatch"}
+    où "mismatch" est l'offset de la première différence ou None.
+    """
+    workers = max(1, int(workers))
+    fd = open_device(path, write=False, direct=direct)
+    start_time = time.monotonic()
+    lock = threading.Lock()
+    done = [0]
+    stop = threading.Event()
+    try:
+        size = get_size(fd)
+
+        def on_read(n: int) -> None:
+            with lock:
+                done[0] += n
+                current = done[0]
+            if progress:
+                progress(current, size)
+
+        if progress:
+            progress(0, size)
+        if workers == 1:
+            mismatches = [verify_range(fd, reference, 0, size, on_read, seed=seed)]
+        else:
+            def run(start: int, end: int) -> Optional[int]:
+                found = verify_range(fd, reference, start, end, on_read, PARALLEL_IO_SIZE, stop, seed)
+                if found is not None:
+                    stop.set()
+                return found
+
+            stripes = stripe_ranges(size, workers)
+            with ThreadPoolExecutor(max_workers=len(stripes)) as executor:
+                futures = [executor.submit(run, start, end) for start, end in stripes]
+                mismatches = [f.result() for f in futures]
+    finally:
+        os.close(fd)
+
+    found = [m for m in mismatches if m is not None]
+    elapsed = max(time.monotonic() - start_time, 1e-9)
+    return {
+        "size": size,
+        "bytes_read": done[0],
+        "elapsed": elapsed,
+        "throughput": done[0] / elapsed,
+        "mismatch": min(found) if found else None,
+    }
+
+
+def sample_confidence(count: int, alpha: float = 0.05) -> float:
+    """
+    Plus grande fraction non effacée du disque qui échapperait, avec une
+    probabilité alpha, à `count` blocs tirés uniformément : 1 - alpha^(1/count).
+    """
+    if count <= 0:
+        return 1.0
+    return 1.0 - alpha ** (1.0 / count)
+
+
+def sample_offsets(size: int, count: int = SAMPLE_COUNT, block_size: int = SAMPLE_BLOCK_SIZE,
+                   logical_block: int = 512, rng=None) -> tuple:
+    """
+    Offsets (triés, alignés sur ALIGNMENT) des blocs à relire : premier et
+    dernier Mio, zone de la GPT de secours, puis `count` offsets uniformes
+    tirés sans remise (au plus le nombre de positions possibles).
+    Le tirage utilise par défaut random.SystemRandom (imprévisible pour le
+    contrôleur).
+    Retourne (offsets, nombre d'offsets aléatoires distincts tirés).
+    """
+    rng = rng or random.SystemRandom()
+    block_size = min(block_size, size)
+    last = max(0, size - block_size)
+    # Offsets multiples du secteur logique : suffisant pour O_DIRECT. Avec des
+    # blocs de 1 Mio, la GPT de secours tombe dans le dernier bloc.
+    gpt_backup = max(0, min(last, size - GPT_BACKUP_SECTORS * logical_block))
+    fixed = {0, last, gpt_backup}
+    slots = last // ALIGNMENT + 1
+    randoms = [slot * ALIGNMENT for slot in rng.sample(range(slots), min(max(0, count), slots))]
+    return sorted(fixed.union(randoms)), len(randoms)
+
+
+def verify_samples(path: str, reference: bytes, count: int = SAMPLE_COUNT,
+                   block_size: int = SAMPLE_BLOCK_SIZE, progress=None, direct: bool = True,
+                   workers: int = SAMPLE_WORKERS, logical_block: int = 512,
+                   alpha: float = 0.05, seed: bytes = None) -> dict:
+    """
+    Relit un échantillon de blocs (voir sample_offsets) avec os.preadv,
+    `workers` lectures en parallèle, et les compare à `reference` (ou au
+    flux aléatoire de `seed`).
+    progress(octets_lus, total) est appelé après chaque bloc.
+    Retourne {"size", "samples", "bytes_read", "elapsed", "throughput",
+    "mismatch", "confidence", "max_unerased_fraction"} ; "samples" et la
+    borne portent sur les blocs tirés au hasard, hors blocs fixes.
+    """
+    workers = max(1, int(workers))
+    fd = open_device(path, write=False, direct=direct)
+    start_time = time.monotonic()
+    lock = threading.Lock()
+    done = [0]
+    stop = threading.Event()
+    try:
+        size = get_size(fd)
+        offsets, drawn = sample_offsets(size, count, block_size, logical_block)
+        ranges = [(o, min(size, o + block_size)) for o in offsets]
+        total = sum(end - start for start, end in ranges)
+
+        def on_read(n: int) -> None:
+            with lock:
+                done[0] += n
+                current = done[0]
+            if progress:
+                progress(current, total)
+
+        def run(start: int, end: int) -> Optional[int]:
+            found = verify_range(fd, reference, start, end, on_read, block_size, stop, seed)
+            if found is not None:
+                stop.set()
+            return found
+
+        if progress:
+            progress(0, total)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            mismatches = list(executor.map(lambda r: run(*r), ranges))
+    finally:
+        os.close(fd)
+
+    found = [m for m in mismatches if m is not None]
+    elapsed = max(time.monotonic() - start_time, 1e-9)
+    return {
+        "size": size,
+        "samples": drawn,
+        "bytes_read": done[0],
+        "elapsed": elapsed,
+        "throughput": done[0] / elapsed,
+        "mismatch": min(found) if found else None,
+        "confidence": 1.0 - alpha,
+        "max_unerased_fraction": sample_confidence(drawn, alpha),
+    }
+
+
+# ── Sondage de débit ───────────────────────────────────────────────────────────
+
+def probe_read_rate(path: str, probe_size: int = PROBE_SIZE, points: int = PROBE_POINTS,
+                    direct: bool = True) -> float:
+    """
+    Estime le débit séquentiel (octets/s) de `path` par des lectures O_DIRECT
+    de `probe_size` octets réparties du début à la fin du disque (les zones
+    externes d'un HDD sont plus rapides que les zones internes). Sans
+    écriture : utilisable avant la confirmation de l'opérateur.
+    """
+    fd = open_device(path, write=False, direct=direct)
+    buf = allocate_buffer(min(probe_size, IO_SIZE))
+    view = memoryview(buf)
+    read_total = 0
+    elapsed = 0.0
+    try:
+        size = get_size(fd)
+        probe_size = min(probe_size, size)
+        span = max(0, size - probe_size)
+        for i in range(max(1, points)):
+            offset = (span * i // max(1, points - 1)) // ALIGNMENT * ALIGNMENT
+            end = offset + probe_size
+            start_time = time.monotonic()
+            while offset < end:
+                n = os.preadv(fd, [view[:min(len(buf), end - offset)]], offset)
+                if n <= 0:
+                    break
+                offset += n
+                read_total += n
+            elapsed += time.monotonic() - start_time
+    finally:
+        view.release()
+        buf.close()
+        os.close(fd)
+    return read_total / max(elapsed, 1e-9)
+
+
+# ── Déchargement noyau (BLKZEROOUT / BLKSECDISCARD / BLKDISCARD) ──────────────
+
+OFFLOAD_MODES = ("zeroout", "secdiscard", "discard")
+
+_OFFLOAD_IOCTLS = {
+    "zeroout": BLKZEROOUT,
+    "secdiscard": BLKSECDISCARD,
+    "discard": BLKDISCARD,
+}
+
+
+def probe_offload(device: str) -> list:
+    """
+    Modes de déchargement utilisables sur `device`, par ordre de préférence.
+    zeroout n'est retenu que si le périphérique annonce WRITE ZEROES en
+    matériel (sinon le noyau écrirait lui-même des pages de zéros) ;
+    secdiscard et discard exigent discard_max_bytes > 0. Le support réel
+    de secdiscard n'est connu qu'à l'appel (EOPNOTSUPP).
+    """
+    limits = get_offload_limits(device)
+    modes = []
+    if limits["write_zeroes_max_bytes"] > 0:
+        modes.append("zeroout")
+    if limits["discard_max_bytes"] > 0:
+        modes += ["secdiscard", "discard"]
+    return modes
+
+
+def offload_device(path: str, mode: str, progress=None,
+                   range_size: int = OFFLOAD_RANGE, granularity: int = 0) -> dict:
+    """
+    Efface `path` par ioctl `mode` ("zeroout", "secdiscard" ou "discard")
+    sur des plages de `range_size` octets (arrondies à `granularity`).
+    progress(octets, total) est appelé après chaque plage.
+    Lève OSError (EOPNOTSUPP…) si le périphérique refuse l'opération.
+    """
+    request = _OFFLOAD_IOCTLS[mode]
+    if granularity > 0:
+        range_size = max(granularity, (range_size // granularity) * granularity)
+    fd = open_device(path, write=True, direct=False)
+    start_time = time.monotonic()
+    try:
+        size = get_size(fd)
+        offset = 0
+        if progress:
+            progress(0, size)
+        while offset < size:
+            length = min(range_size, size - offset)
+            range_ioctl(fd, request, offset, length)
+            offset += length
+            if progress:
+                progress(offset, size)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    elapsed = max(time.monotonic() - start_time, 1e-9)
+    return {
+        "size": size,
+        "mode": mode,
+        "elapsed": elapsed,
+        "throughput": size / elapsed,
+    }
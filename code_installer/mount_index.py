@@ -0,0 +1,221 @@
+"""
+mount_index.py – Index de la topologie des montages pour protéger le système.
+
+Construit à partir de /proc/self/mountinfo : chaque point de montage est
+associé au(x) périphérique(s) bloc qui le portent, y compris à travers
+les couches intermédiaires :
+
+  - périphérique loop (squashfs d'un live, image montée) -> fichier
+    d'appui (loop/backing_file) -> montage qui contient ce fichier ;
+  - overlayfs -> répertoires lowerdir/upperdir -> montages qui les portent ;
+  - dm-crypt, LVM, md -> disques physiques (graphe sysfs, blockgraph.py).
+
+Les disques « système » sont ceux qui portent la racine et les montages
+vitaux (/boot, /usr, /var…), le média de démarrage d'un système live et
+tout espace d'échange actif (/proc/swaps).
+
+/proc/self/mountinfo signale chaque modification de la table des montages
+par POLLPRI : l'index n'est relu que dans ce cas, une consultation sans
+changement ne coûte qu'un appel poll().
+"""
+import os
+import select
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+from blockgraph import get_block_graph
+
+MOUNTINFO = "/proc/self/mountinfo"
+PROC_SWAPS = "/proc/swaps"
+SYS_DEV_BLOCK = "/sys/dev/block"
+SYS_BLOCK = "/sys/block"
+
+# Montages dont la perte rend le système inutilisable
+SYSTEM_MOUNTPOINTS = ("/", "/boot", "/boot/efi", "/usr", "/var")
+# Répertoires où les systèmes live montent leur média de démarrage
+LIVE_MEDIUM_MARKERS = ("/run/live", "/lib/live", "/live/", "/cdrom", "/run/initramfs/live")
+
+
+def _unescape(field: str) -> str:
+    """mountinfo échappe espace, tabulation, \\n et \\ en octal (\\040…)."""
+    if "\\" not in field:
+        return field
+    out, i = [], 0
+    while i < len(field):
+        if field[i] == "\\" and field[i + 1:i + 4].isdigit():
+            out.append(chr(int(field[i + 1:i + 4], 8)))
+            i += 4
+        else:
+            out.append(field[i])
+            i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class Mount:
+    """Une ligne de mountinfo."""
+    mount_id: int
+    parent_id: int
+    dev: str                # majeur:mineur du superbloc
+    root: str               # racine du montage dans le système de fichiers
+    mountpoint: str
+    fstype: str
+    source: str
+    super_options: str
+
+
+def parse_mountinfo(text: str) -> List[Mount]:
+    """Décode le contenu de /proc/<pid>/mountinfo."""
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        if "-" not in fields or len(fields) < 7:
+            continue
+        sep = fields.index("-", 6)
+        tail = fields[sep + 1:] + ["", "", ""]
+        mounts.append(Mount(
+            mount_id=int(fields[0]),
+            parent_id=int(fields[1]),
+            dev=fields[2],
+            root=_unescape(fields[3]),
+            mountpoint=_unescape(fields[4]),
+            fstype=tail[0],
+            source=_unescape(tail[1]),
+            super_options=_unescape(tail[2]),
+        ))
+    return mounts
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def _kernel_name(dev: str) -> str:
+    """Nom noyau (sda1, dm-0, loop0…) d'un majeur:mineur, chaîne vide si aucun."""
+    if dev.startswith("0:"):
+        return ""       # système de fichiers sans périphérique (tmpfs, overlay, btrfs…)
+    path = os.path.realpath(os.path.join(SYS_DEV_BLOCK, dev))
+    return os.path.basename(path) if os.path.exists(path) else ""
+
+
+class MountIndex:
+    """
+    Table des montages et résolution vers les disques physiques.
+    Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, path: str = MOUNTINFO) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._poller = None
+        self._mounts: List[Mount] = []
+
+    def _reload(self) -> None:
+        self._file.seek(0)
+        self._mounts = parse_mountinfo(self._file.read())
+
+    def mounts(self) -> List[Mount]:
+        """Montages courants (relus seulement après un POLLPRI)."""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self._path, "r")
+                self._poller = select.poll()
+                self._poller.register(self._file, select.POLLPRI | select.POLLERR)
+                self._reload()
+            elif self._poller.poll(0):
+                # Lire le fichier jusqu'au bout acquitte l'événement
+                self._reload()
+            return self._mounts
+
+    def mount_for_path(self, path: str) -> Optional[Mount]:
+        """Montage le plus profond contenant `path` (à égalité, le dernier monté)."""
+        best = None
+        for mount in self.mounts():
+            point = mount.mountpoint
+            if point == "/" or path == point or path.startswith(point + "/"):
+                if best is None or len(point) >= len(best.mountpoint):
+                    best = mount
+        return best
+
+    def _path_devices(self, path: str, seen: Set[str]) -> Set[str]:
+        mount = self.mount_for_path(os.path.realpath(path))
+        return self._mount_devices(mount, seen) if mount else set()
+
+    def _device_chain(self, name: str, seen: Set[str]) -> Set[str]:
+        """Le périphérique, ses couches inférieures et, pour un loop, le disque de son fichier."""
+        if not name or name in seen:
+            return set()
+        seen.add(name)
+        graph = get_block_graph()
+        devices = {name} | graph.physical_disks(name)
+        for device in list(devices):
+            backing = _read(os.path.join(SYS_BLOCK, device, "loop", "backing_file")).strip()
+            if backing:
+                devices |= self._path_devices(backing, seen)
+        return devices
+
+    def _mount_devices(self, mount: Mount, seen: Set[str]) -> Set[str]:
+        key = f"mount:{mount.mount_id}"
+        if key in seen:
+            return set()
+        seen.add(key)
+        name = _kernel_name(mount.dev)
+        if not name and mount.source.startswith("/dev/"):
+            name = get_block_graph().resolve(mount.source)
+        devices = self._device_chain(name, seen)
+        if mount.fstype == "overlay":
+            for option in mount.super_options.split(","):
+                name, _, value = option.partition("=")
+                if name in ("lowerdir", "upperdir") and value:
+                    for layer in value.split(":"):
+                        devices |= self._path_devices(layer, seen)
+        return devices
+
+    def devices_for_path(self, path: str) -> Set[str]:
+        """Périphériques (toutes couches) qui portent `path`."""
+        return self._path_devices(path, set())
+
+    def swap_devices(self) -> Set[str]:
+        """Périphériques portant un espace d'échange actif (partition ou fichier)."""
+        devices = set()
+        for line in _read(PROC_SWAPS).splitlines()[1:]:
+            fields = line.split()
+            if not fields:
+                continue
+            filename = _unescape(fields[0])
+            if len(fields) > 1 and fields[1] == "partition":
+                devices |= self._device_chain(get_block_graph().resolve(filename), set())
+            else:
+                devices |= self._path_devices(filename, set())
+        return devices
+
+    def system_devices(self) -> Set[str]:
+        """Tous les périphériques (disques, partitions, mappages…) dont dépend le système."""
+        devices = set()
+        for mount in self.mounts():
+            point = mount.mountpoint
+            if point in SYSTEM_MOUNTPOINTS or any(marker in point for marker in LIVE_MEDIUM_MARKERS):
+                devices |= self._mount_devices(mount, set())
+        return devices | self.swap_devices()
+
+    def system_disks(self) -> Set[str]:
+        """Disques dont dépend le système (racine, /boot, swap, média live…), loops compris."""
+        graph = get_block_graph()
+        return {
+            name for name in self.system_devices()
+            if name not in graph.parent and not graph.slaves.get(name)
+        }
+
+
+_index = MountIndex()
+
+
+def get_mount_index() -> MountIndex:
+    """Index partagé du processus."""
+    return _index
@@ -0,0 +1,152 @@
+"""
+partition_table.py – Écriture en processus d'une table MBR (DOS) ou GPT.
+
+Remplace la chaîne parted mklabel / mkpart : la table est construite en
+mémoire (une partition primaire de 1 Mio jusqu'à la fin du disque, comme
+`parted mkpart primary 1MiB 100%`) puis écrite par quelques pwrite et un
+fsync. Fonctionne aussi sur un fichier image (taille de secteur 512 par
+défaut), ce qui permet de la tester sans périphérique.
+
+GPT : MBR de protection (type 0xEE), en-tête et table primaires aux LBA 1
+et 2, copies de secours en fin de disque, CRC32 (zlib) sur l'en-tête et
+sur la table d'entrées (spécification UEFI, chapitre 5).
+"""
+import os
+import stat
+import struct
+import uuid
+import zlib
+
+from blkdev import read_sysfs_int
+
+PARTITION_START = 1024 * 1024      # premier octet de la partition (alignement 1 Mio)
+GPT_ENTRY_COUNT = 128
+GPT_ENTRY_SIZE = 128
+GPT_HEADER_SIZE = 92
+GPT_PARTITION_NAME = "primary"     # nom donné par parted mkpart primary
+
+# Types de partition selon le système de fichiers (défaut : Linux, comme parted)
+MBR_TYPES = {"ntfs": 0x07, "vfat": 0x0C, "ext4": 0x83}
+MBR_DEFAULT_TYPE = 0x83
+GPT_TYPES = {
+    "ntfs": uuid.UUID("EBD0A0A2-B9E5-4433-87C0-68B6B72699C7"),   # Microsoft basic data
+    "vfat": uuid.UUID("EBD0A0A2-B9E5-4433-87C0-68B6B72699C7"),
+    "ext4": uuid.UUID("0FC63DAF-8483-4772-8E79-3D69D8477DE4"),   # Linux filesystem data
+}
+GPT_DEFAULT_TYPE = GPT_TYPES["ext4"]
+
+
+def _chs(lba: int) -> bytes:
+    """Adresse CHS (255 têtes, 63 secteurs) d'un LBA, saturée à 1023/254/63."""
+    cylinder, rest = divmod(lba, 255 * 63)
+    if cylinder > 1023:
+        return b"\xfe\xff\xff"
+    head, sector = divmod(rest, 63)
+    return bytes([head, ((cylinder >> 2) & 0xC0) | (sector + 1), cylinder & 0xFF])
+
+
+def _mbr_entry(part_type: int, start: int, count: int, bootable: bool = False) -> bytes:
+    return struct.pack("<B3sB3sII", 0x80 if bootable else 0, _chs(start), part_type,
+                       _chs(start + count - 1), start, count)
+
+
+def _mbr_sector(entry: bytes, sector_size: int) -> bytes:
+    """Secteur 0 : signature de disque aléatoire, une entrée, signature 0x55AA."""
+    sector = bytearray(sector_size)
+    sector[440:444] = os.urandom(4)
+    sector[446:462] = entry
+    sector[510:512] = b"\x55\xaa"
+    return bytes(sector)
+
+
+def build_mbr(total_sectors: int, sector_size: int = 512, part_type: int = MBR_DEFAULT_TYPE) -> list:
+    """
+    Table DOS à une partition primaire. Retourne [(offset, données)] à écrire,
+    y compris l'effacement des en-têtes GPT éventuels (sinon les outils
+    continueraient à voir l'ancienne GPT de secours en fin de disque).
+    Lève ValueError si le disque dépasse la limite de 2^32 secteurs du MBR.
+    """
+    start = PARTITION_START // sector_size
+    count = total_sectors - start
+    if total_sectors > 0xFFFFFFFF:
+        raise ValueError("disque trop grand pour une table MBR (2^32 secteurs), utiliser GPT")
+    if count <= 0:
+        raise ValueError("disque trop petit pour une partition alignée sur 1 Mio")
+
+    gpt_sectors = 1 + GPT_ENTRY_COUNT * GPT_ENTRY_SIZE // sector_size
+    blank = bytes(gpt_sectors * sector_size)
+    return [
+        (0, _mbr_sector(_mbr_entry(part_type, start, count), sector_size)),
+        (sector_size, blank),
+        ((total_sectors - gpt_sectors) * sector_size, blank),
+    ]
+
+
+def _gpt_header(current: int, backup: int, first_usable: int, last_usable: int,
+                disk_guid: uuid.UUID, entries_lba: int, entries_crc: int, sector_size: int) -> bytes:
+    fields = [b"EFI PART", 0x00010000, GPT_HEADER_SIZE, 0, 0, current, backup,
+              first_usable, last_usable, disk_guid.bytes_le, entries_lba,
+              GPT_ENTRY_COUNT, GPT_ENTRY_SIZE, entries_crc]
+    layout = "<8sIIIIQQQQ16sQIII"
+    crc = zlib.crc32(struct.pack(layout, *fields))
+    fields[3] = crc
+    return struct.pack(layout, *fields).ljust(sector_size, b"\0")
+
+
+def build_gpt(total_sectors: int, sector_size: int = 512, type_guid: uuid.UUID = GPT_DEFAULT_TYPE) -> list:
+    """
+    MBR de protection, GPT primaire et GPT de secours avec une partition.
+    Retourne [(offset, données)] à écrire.
+    """
+    entries_sectors = GPT_ENTRY_COUNT * GPT_ENTRY_SIZE // sector_size
+    first_usable = 2 + entries_sectors
+    last_lba = total_sectors - 1
+    backup_entries_lba = last_lba - entries_sectors
+    last_usable = backup_entries_lba - 1
+    start = PARTITION_START // sector_size
+    if last_usable <= start:
+        raise ValueError("disque trop petit pour une partition alignée sur 1 Mio")
+
+    name = GPT_PARTITION_NAME.encode("utf-16-le").ljust(72, b"\0")
+    entry = struct.pack("<16s16sQQQ72s", type_guid.bytes_le, uuid.uuid4().bytes_le,
+                        start, last_usable, 0, name)
+    entries = entry.ljust(GPT_ENTRY_COUNT * GPT_ENTRY_SIZE, b"\0")
+    entries_crc = zlib.crc32(entries)
+    disk_guid = uuid.uuid4()
+
+    protective = _mbr_entry(0xEE, 1, min(total_sectors - 1, 0xFFFFFFFF))
+    primary = _gpt_header(1, last_lba, first_usable, last_usable, disk_guid, 2, entries_crc, sector_size)
+    backup = _gpt_header(last_lba, 1, first_usable, last_usable, disk_guid,
+                         backup_entries_lba, entries_crc, sector_size)
+    return [
+        (0, _mbr_sector(protective, sector_size)),
+        (sector_size, primary + entries),
+        (backup_entries_lba * sector_size, entries + backup),
+    ]
+
+
+def write_partition_table(path: str, table: str = "mbr", fs_choice: str = None,
+                          sector_size: int = None) -> int:
+    """
+    Écrit une table `table` ("mbr" ou "gpt") à une partition sur `path`
+    (périphérique bloc ou fichier image) et la synchronise sur le support.
+    La taille de secteur est lue dans sysfs pour un périphérique (512 pour
+    une image). Retourne l'offset en octets du début de la partition.
+    """
+    fd = os.open(path, os.O_RDWR | getattr(os, "O_CLOEXEC", 0))
+    try:
+        if sector_size is None:
+            is_block = stat.S_ISBLK(os.fstat(fd).st_mode)
+            sector_size = read_sysfs_int(os.path.basename(path), "queue/logical_block_size", 512) \
+                if is_block else 512
+        total_sectors = os.lseek(fd, 0, os.SEEK_END) // sector_size
+        if table.lower() == "gpt":
+            writes = build_gpt(total_sectors, sector_size, GPT_TYPES.get(fs_choice, GPT_DEFAULT_TYPE))
+        else:
+            writes = build_mbr(total_sectors, sector_size, MBR_TYPES.get(fs_choice, MBR_DEFAULT_TYPE))
+        for offset, data in writes:
+            os.pwrite(fd, data, offset)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return PARTITION_START
@@ -0,0 +1,254 @@
+"""
+progress.py – Événements de progression typés pour chaque étape d'un disque.
+
+Chaque étape (passes d'écrasement, luksFormat, remplissage dd, effacement
+de l'en-tête, partitionnement, formatage…) alimente un ProgressTracker
+qui calcule débit instantané, débit lissé (EWMA) et temps restant, puis
+publie un ProgressEvent au plus EVENT_INTERVAL secondes d'intervalle :
+24 disques en parallèle ne produisent ainsi qu'une centaine d'appels par
+seconde au total, quelle que soit la fréquence des écritures. L'interface
+graphique les reçoit par un ProgressBus qu'elle échantillonne à cadence
+fixe.
+
+Les sorties d'outils externes (dd status=progress, cryptsetup) sont lues
+par segments séparés par \r ou \n : dd redessine sa ligne avec \r, une
+lecture par readline() ne rendrait rien avant la fin de la commande.
+"""
+import itertools
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+EVENT_INTERVAL = 0.5     # secondes minimum entre deux événements d'un même disque
+EWMA_ALPHA     = 0.2     # poids de la dernière mesure dans le débit lissé
+READ_CHUNK     = 4096    # octets lus par appel os.read sur un tube
+MAX_SEGMENT    = 4096    # longueur maximale conservée d'un segment incomplet
+
+_SEGMENT_SPLIT = re.compile(rb"[\r\n]")
+# « 1234567168 bytes (1.2 GB, 1.1 GiB) copied, 5 s, 247 MB/s » (dd, LC_ALL=C)
+_DD_PROGRESS = re.compile(r"^(\d+) bytes\b.*\bcopied\b(?:.*,\s*([\d.]+)\s*([kMGTPE]?)B/s)?")
+_DD_UNITS = {"": 1, "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18}
+
+# Répartition de la progression globale d'un disque entre ses étapes
+STAGE_PLANS = {
+    "overwrite": [("erase", 96), ("header_wipe", 1), ("partition", 1), ("format", 2)],
+    "crypto":    [("luks_format", 1), ("fill", 94), ("header_wipe", 1), ("partition", 1), ("format", 3)],
+    "offload":   [("offload", 90), ("header_wipe", 2), ("partition", 3), ("format", 5)],
+    "format":    [("partition", 40), ("format", 60)],
+    # Avec relecture de vérification (lecture complète du disque après l'effacement)
+    "overwrite_verify": [("erase", 64), ("verify", 32), ("header_wipe", 1), ("partition", 1), ("format", 2)],
+    "offload_verify":   [("offload", 10), ("verify", 80), ("header_wipe", 2), ("partition", 3), ("format", 5)],
+    # Avec vérification échantillonnée (quelques minutes de lecture)
+    "overwrite_sample": [("erase", 94), ("verify", 2), ("header_wipe", 1), ("partition", 1), ("format", 2)],
+    "offload_sample":   [("offload", 60), ("verify", 30), ("header_wipe", 2), ("partition", 3), ("format", 5)],
+}
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Instantané de progression d'un disque pour une étape donnée."""
+    device: str
+    stage: str
+    bytes_done: int
+    bytes_total: int
+    pass_index: int
+    pass_count: int
+    rate: float                 # octets/s depuis l'événement précédent
+    rate_ewma: float            # octets/s, moyenne mobile exponentielle
+    eta: Optional[float]        # secondes restantes pour l'étape (None si inconnu)
+    percent: float              # progression globale du disque, 0–100
+
+    @property
+    def stage_percent(self) -> float:
+        """Progression de l'étape courante (toutes passes confondues), 0–100."""
+        if self.bytes_total <= 0:
+            return 0.0
+        done = (self.pass_index - 1) * self.bytes_total + self.bytes_done
+        return min(100.0, 100.0 * done / (self.pass_count * self.bytes_total))
+
+
+class ProgressTracker:
+    """
+    Agrège les mises à jour brutes d'un disque et publie des ProgressEvent
+    limités à EVENT_INTERVAL. Utilisable depuis plusieurs threads (écriture
+    par bandes parallèles).
+    """
+
+    def __init__(self, device: str, callback, plan: str = "overwrite",
+                 interval: float = EVENT_INTERVAL) -> None:
+        self.device = device
+        self.callback = callback
+        self.interval = interval
+        stages = STAGE_PLANS[plan]
+        total_weight = sum(w for _, w in stages) or 1
+        self._offsets = {}
+        self._weights = {}
+        acc = 0.0
+        for name, weight in stages:
+            self._offsets[name] = 100.0 * acc / total_weight
+            self._weights[name] = 100.0 * weight / total_weight
+            acc += weight
+        self._lock = threading.Lock()
+        self._stage = None
+        self._pass = 0
+        self._last_emit = 0.0
+        self._last_time = 0.0
+        self._last_bytes = 0
+        self._rate = 0.0
+        self._ewma = 0.0
+
+    def _overall(self, stage: str, fraction: float) -> float:
+        if stage not in self._offsets:
+            return 0.0
+        fraction = max(0.0, min(1.0, fraction))
+        return self._offsets[stage] + self._weights[stage] * fraction
+
+    def update(self, stage: str, bytes_done: int, bytes_total: int,
+               pass_index: int = 1, pass_count: int = 1, force: bool = False,
+               rate: Optional[float] = None) -> None:
+        """
+        Enregistre l'avancement ; publie un événement si l'intervalle est écoulé.
+        rate : débit rapporté par l'outil (dd), retenu à la place du débit
+        calculé entre deux mises à jour.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if stage != self._stage or pass_index != self._pass:
+                # Nouvelle étape ou nouvelle passe : l'offset repart de zéro,
+                # le débit lissé n'est conservé que d'une passe à l'autre
+                if stage != self._stage:
+                    self._ewma = 0.0
+                self._stage, self._pass = stage, pass_index
+                self._last_time, self._last_bytes = now, bytes_done
+                force = True
+
+            if not force and now - self._last_emit < self.interval:
+                return
+
+            dt = now - self._last_time
+            if rate is not None and rate > 0:
+                self._rate = rate
+                self._ewma = self._rate if self._ewma == 0.0 else (
+                    EWMA_ALPHA * self._rate + (1 - EWMA_ALPHA) * self._ewma)
+            elif dt > 0 and bytes_done >= self._last_bytes:
+                self._rate = (bytes_done - self._last_bytes) / dt
+                self._ewma = self._rate if self._ewma == 0.0 else (
+                    EWMA_ALPHA * self._rate + (1 - EWMA_ALPHA) * self._ewma)
+            self._last_time, self._last_bytes = now, bytes_done
+            self._last_emit = now
+
+            eta = None
+            if bytes_total > 0 and self._ewma > 0:
+                remaining = (pass_count - pass_index) * bytes_total + (bytes_total - bytes_done)
+                eta = remaining / self._ewma
+
+            fraction = 0.0
+            if bytes_total > 0:
+                fraction = ((pass_index - 1) * bytes_total + bytes_done) / (pass_count * bytes_total)
+            event = ProgressEvent(
+                device=self.device,
+                stage=stage,
+                bytes_done=bytes_done,
+                bytes_total=bytes_total,
+                pass_index=pass_index,
+                pass_count=pass_count,
+                rate=self._rate,
+                rate_ewma=self._ewma,
+                eta=eta,
+                percent=self._overall(stage, fraction),
+            )
+
+        if self.callback:
+            self.callback(event)
+
+    def stage_started(self, stage: str, bytes_total: int = 0) -> None:
+        """Publie immédiatement le début d'une étape."""
+        self.update(stage, 0, bytes_total, force=True)
+
+    def stage_done(self, stage: str, bytes_total: int = 1, pass_count: int = 1) -> None:
+        """Publie immédiatement la fin d'une étape."""
+        self.update(stage, bytes_total, bytes_total, pass_count, pass_count, force=True)
+
+
+class ProgressBus:
+    """
+    Dernière valeur publiée pour chaque disque, entre les threads de travail
+    et la boucle principale de l'interface.
+
+    post() remplace la case du disque par une affectation de dictionnaire,
+    atomique sous le GIL : ni verrou ni file qui grossit, seule la valeur la
+    plus récente survit entre deux lectures. changes() est appelé par un
+    seul lecteur (l'interface, à cadence fixe) et rend les cases modifiées
+    depuis l'appel précédent : le coût d'un rafraîchissement dépend du
+    nombre de disques, pas de la fréquence de leurs publications.
+    """
+
+    def __init__(self) -> None:
+        self._slots: Dict[Hashable, tuple] = {}     # clé -> (séquence, valeur)
+        self._sequence = itertools.count(1)
+        self._seen: Dict[Hashable, int] = {}        # côté lecteur uniquement
+
+    def post(self, key: Hashable, value) -> None:
+        """Publie la valeur courante de `key` (depuis n'importe quel thread)."""
+        self._slots[key] = (next(self._sequence), value)
+
+    def clear(self) -> None:
+        """Oublie toutes les cases (nouveau lot)."""
+        self._slots.clear()
+
+    def changes(self) -> Dict[Hashable, object]:
+        """Cases modifiées depuis le dernier appel, de la plus ancienne à la plus récente publication."""
+        slots = dict(self._slots)
+        changed = sorted(
+            (sequence, key, value)
+            for key, (sequence, value) in slots.items()
+            if self._seen.get(key) != sequence
+        )
+        self._seen = {key: sequence for key, (sequence, _) in slots.items()}
+        return {key: value for _, key, value in changed}
+
+
+def format_duration(seconds: float) -> str:
+    """Durée au format h:mm:ss."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}"
+
+
+def iter_output_segments(stream, chunk_size: int = READ_CHUNK, max_segment: int = MAX_SEGMENT):
+    """
+    Itère sur la sortie d'un tube (mode binaire) découpée sur \r et \n.
+    Chaque segment est rendu dès que son séparateur arrive ; seul le
+    segment en cours est conservé, tronqué à `max_segment` octets.
+    """
+    fd = stream.fileno()
+    pending = b""
+    while True:
+        chunk = os.read(fd, chunk_size)
+        if not chunk:
+            break
+        parts = _SEGMENT_SPLIT.split(pending + chunk)
+        pending = parts.pop()[-max_segment:]
+        for part in parts:
+            text = part.decode("utf-8", errors="replace").strip()
+            if text:
+                yield text
+    text = pending.decode("utf-8", errors="replace").strip()
+    if text:
+        yield text
+
+
+def parse_dd_progress(line: str) -> Optional[Tuple[int, Optional[float]]]:
+    """
+    Retourne (octets copiés, débit moyen en octets/s) d'une ligne de
+    progression dd, le débit valant None s'il est absent ; None si la ligne
+    n'est pas une ligne de progression.
+    """
+    match = _DD_PROGRESS.match(line)
+    if not match:
+        return None
+    rate = float(match.group(2)) * _DD_UNITS[match.group(3)] if match.group(2) else None
+    return int(match.group(1)), rate
@@ -0,0 +1,284 @@
+"""
+scheduler.py – Ordonnancement des lots de disques selon la topologie.
+
+Les disques sont regroupés par lien partagé, d'après le chemin sysfs de
+leur parent : hub USB (ou bus racine) et expandeur SAS. Le débit nominal
+du lien est lu dans sysfs (vitesse USB négociée, débit des phys SAS) et
+le nombre d'effacements simultanés du groupe est limité à ce que le lien
+peut porter, estimé à partir du débit mesuré de chaque disque (historique
+du modèle ou lecture de sondage, voir disk_operations.plan_batch) ; faute
+de mesure, une valeur type HDD/SSD est utilisée. Les disques sur un lien
+dédié (SATA, NVMe, virtio…) forment chacun leur groupe et ne sont jamais
+limités.
+
+JobScheduler est permanent et accepte de nouveaux disques à tout moment
+(branchés pendant un lot de plusieurs heures), chacun démarrant dès qu'un
+créneau de son lien se libère.
+"""
+import os
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from blkdev import SYS_BLOCK, is_rotational
+
+LINK_EFFICIENCY = 0.8          # part utile du débit nominal d'un lien
+HDD_RATE = 250_000_000         # octets/s d'un disque rotatif, faute de mesure
+SSD_RATE = 550_000_000         # octets/s d'un SSD, faute de mesure
+
+_USB_DEVICE = re.compile(r"^\d+-[\d.]+$")        # 2-1, 2-1.3…
+_USB_ROOT = re.compile(r"^usb\d+$")
+_SAS_EXPANDER = re.compile(r"^expander-\d+:\d+$")
+_SAS_RATE = re.compile(r"([\d.]+)\s*Gbit")
+
+# États d'un travail du JobScheduler
+JOB_QUEUED = "queued"          # en attente d'un créneau
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class LinkGroup:
+    """Disques partageant un même lien amont."""
+    key: str
+    bandwidth: float                     # octets/s utiles, 0 si lien dédié/inconnu
+    disks: List[str] = field(default_factory=list)
+    slots: int = 1                       # effacements simultanés autorisés
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _usb_bandwidth(hub_path: str) -> float:
+    """Débit du lien amont d'un hub USB (attribut speed, en Mbit/s)."""
+    try:
+        return float(_read(os.path.join(hub_path, "speed"))) * 1e6 / 8
+    except ValueError:
+        return 0.0
+
+
+def _sas_bandwidth(port_path: str) -> float:
+    """Débit cumulé des phys du port SAS qui relie l'expandeur au contrôleur."""
+    total = 0.0
+    try:
+        entries = os.listdir(port_path)
+    except OSError:
+        return 0.0
+    for entry in entries:
+        if not entry.startswith("phy-"):
+            continue
+        match = _SAS_RATE.search(_read(f"/sys/class/sas_phy/{entry}/negotiated_linkrate"))
+        if match:
+            # Codage 8b/10b : 10 bits sur le lien par octet utile
+            total += float(match.group(1)) * 1e9 / 10
+    return total
+
+
+def topology_link(device: str) -> tuple:
+    """
+    Retourne (clé, débit en octets/s) du lien amont partagé de `device`.
+    Débit 0 : lien dédié ou inconnu, aucune limite à appliquer.
+    """
+    device = device.replace("/dev/", "")
+    path = os.path.realpath(os.path.join(SYS_BLOCK, device))
+    parts = path.split("/")
+
+    # Expandeur SAS : tous les disques en aval partagent le port amont
+    for i, part in enumerate(parts):
+        if _SAS_EXPANDER.match(part):
+            key = "/".join(parts[:i + 1])
+            return key, _sas_bandwidth("/".join(parts[:i]))
+
+    # USB : le lien partagé est celui du hub auquel le disque est branché
+    usb = [i for i, part in enumerate(parts) if _USB_DEVICE.match(part) or _USB_ROOT.match(part)]
+    if len(usb) >= 2:
+        key = "/".join(parts[:usb[-2] + 1])
+        return key, _usb_bandwidth(key)
+
+    return path, 0.0
+
+
+def group_disks(disks: List[str], rates: Dict[str, float] = None) -> List[LinkGroup]:
+    """
+    Regroupe les disques par lien et calcule le nombre de créneaux de chaque
+    groupe à partir des débits mesurés `rates` (octets/s, par disque), ou de
+    expected_rate pour les disques absents.
+    """
+    rates = rates or {}
+    groups = {}
+    for disk in disks:
+        key, bandwidth = topology_link(disk)
+        group = groups.setdefault(key, LinkGroup(key, bandwidth * LINK_EFFICIENCY))
+        group.disks.append(disk)
+
+    for group in groups.values():
+        group.slots = link_slots(group.bandwidth, [rates.get(d) or expected_rate(d) for d in group.disks])
+    return list(groups.values())
+
+
+def expected_rate(disk: str) -> float:
+    """Débit d'effacement type d'un disque (octets/s), faute de mesure."""
+    return HDD_RATE if is_rotational(disk.replace("/dev/", "")) else SSD_RATE
+
+
+def link_slots(bandwidth: float, rates: List[float]) -> int:
+    """Effacements simultanés qu'un lien peut porter pour des disques de débits `rates`."""
+    if bandwidth <= 0 or not rates:
+        return max(1, len(rates))
+    expected = sum(rates) / len(rates)
+    return max(1, min(len(rates), int(bandwidth // expected)))
+
+
+@dataclass
+class Job:
+    """Effacement d'un disque confié au JobScheduler."""
+    disk: str
+    link: str                            # clé du lien amont (topology_link)
+    bandwidth: float                     # octets/s utiles du lien, 0 si dédié
+    rate: float                          # débit mesuré (ou type) du disque
+    sequence: int                        # ordre de soumission
+    future: Future = field(default_factory=Future, repr=False)
+    state: str = JOB_QUEUED
+    error: str = ""
+
+
+class JobScheduler:
+    """
+    Ordonnanceur permanent : les disques peuvent être soumis à tout moment,
+    y compris pendant que d'autres s'effacent. Chaque travail démarre dès
+    que son lien a un créneau libre (group_disks et link_slots,
+    recalculés avec les disques présents) et, si `max_jobs` est non nul,
+    dans la limite globale. Sur un même lien, les disques démarrent dans
+    l'ordre de soumission.
+
+        scheduler = JobScheduler(on_state=callback)
+        future = scheduler.submit("sdb", func, "sdb", ..., rate=plan.rate)
+
+    `on_state(job)` est appelé depuis le thread du travail à chaque
+    changement d'état (queued, running, done, failed).
+    """
+
+    def __init__(self, max_jobs: int = 0, log_func=None, on_state=None) -> None:
+        self.max_jobs = max_jobs
+        self.log_func = log_func
+        self.on_state = on_state
+        self._cond = threading.Condition()
+        self._jobs: Dict[str, Job] = {}
+        self._threads: List[threading.Thread] = []
+        self._sequence = 0
+        self._closed = False
+
+    def submit(self, disk: str, func, *args, rate: float = 0.0, **kwargs) -> Future:
+        """
+        Ajoute l'effacement de `disk` : func(*args, **kwargs) sera exécuté
+        dès qu'un créneau se libère. `rate` est le débit mesuré du disque
+        (plan_batch), expected_rate s'il est nul. ValueError si le disque
+        est déjà en attente ou en cours, RuntimeError après shutdown().
+        """
+        link, bandwidth = topology_link(disk)
+        rate = rate or expected_rate(disk)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ordonnanceur arrêté")
+            current = self._jobs.get(disk)
+            if current is not None and current.state in (JOB_QUEUED, JOB_RUNNING):
+                raise ValueError(f"{disk} est déjà en file d'effacement")
+            self._sequence += 1
+            job = Job(disk, link, bandwidth * LINK_EFFICIENCY, rate, self._sequence)
+            self._jobs[disk] = job
+            self._threads = [t for t in self._threads if t.is_alive()]
+            # Pas de thread démon : un effacement n'est jamais coupé à la sortie
+            # de l'interpréteur (nettoyage dm-crypt, fichiers de clé…)
+            thread = threading.Thread(target=self._run, args=(job, func, args, kwargs),
+                                      name=f"job-{disk.replace('/dev/', '')}")
+            self._threads.append(thread)
+        self._notify(job)
+        thread.start()
+        return job.future
+
+    def jobs(self) -> Dict[str, Job]:
+        """Dernier travail connu de chaque disque (terminés compris)."""
+        with self._cond:
+            return dict(self._jobs)
+
+    def pending(self) -> List[str]:
+        """Disques en attente ou en cours d'effacement."""
+        with self._cond:
+            return [job.disk for job in self._jobs.values() if job.state in (JOB_QUEUED, JOB_RUNNING)]
+
+    def wait(self, timeout: float = None) -> bool:
+        """Attend la fin de tous les travaux (y compris ceux ajoutés entre-temps)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not any(
+                job.state in (JOB_QUEUED, JOB_RUNNING) for job in self._jobs.values()), timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Refuse les nouvelles soumissions ; attend les travaux en cours si `wait`."""
+        with self._cond:
+            self._closed = True
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _can_start(self, job: Job) -> bool:
+        active = [j for j in self._jobs.values() if j.state in (JOB_QUEUED, JOB_RUNNING)]
+        if self.max_jobs and sum(j.state == JOB_RUNNING for j in active) >= self.max_jobs:
+            return False
+        same_link = [j for j in active if j.link == job.link]
+        if any(j.state == JOB_QUEUED and j.sequence < job.sequence for j in same_link):
+            return False
+        slots = link_slots(job.bandwidth, [j.rate for j in same_link])
+        return sum(j.state == JOB_RUNNING for j in same_link) < slots
+
+    def _run(self, job: Job, func, args, kwargs) -> None:
+        with self._cond:
+            if not self._can_start(job) and self.log_func:
+                self.log_func(f"{job.disk} en attente d'un créneau sur son lien")
+            self._cond.wait_for(lambda: self._can_start(job))
+            job.state = JOB_RUNNING
+            # Les travaux suivants du même lien attendaient que celui-ci démarre
+            self._cond.notify_all()
+        self._notify(job)
+
+        error = None
+        if not job.future.set_running_or_notify_cancel():
+            error = "annulé"
+        else:
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                error = e
+
+        with self._cond:
+            job.state = JOB_DONE if error is None else JOB_FAILED
+            job.error = "" if error is None else str(error)
+            self._cond.notify_all()
+        self._notify(job)
+        if isinstance(error, BaseException):
+            job.future.set_exception(error)
+        elif error is None:
+            job.future.set_result(result)
+
+    def _notify(self, job: Job) -> None:
+        if self.on_state is None:
+            return
+        try:
+            self.on_state(job)
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=True)
+        return False
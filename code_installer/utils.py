@@ -2,6 +2,9 @@ import subprocess
 import logging
 import sys
 
+from blockgraph import get_block_graph
+from inventory import get_disk_records
+
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -22,43 +25,6 @@ def run_command(command_list: list[str]) -> str:
         sys.exit(130)
 
 
-def get_disk_filesystem(device: str) -> str:
-    """
-    Détecte le système de fichiers de la première partition d'un disque via lsblk.
-    Retourne le type (ex. 'ext4', 'ntfs', 'vfat') ou '—' si non détecté.
-    """
-    try:
-        output = run_command(["lsblk", "-o", "FSTYPE", "-n", f"/dev/{device}"])
-        if output:
-            fstypes = [line.strip() for line in output.split('\n') if line.strip()]
-            if fstypes:
-                return fstypes[0]
-        return "—"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return "—"
-
-
-def get_disk_partition_table(device: str) -> str:
-    """
-    Détecte la table de partition d'un disque via lsblk.
-    Retourne 'GPT', 'MBR', 'Aucune' ou 'Inconnue'.
-    """
-    try:
-        output = run_command(["lsblk", "-o", "PTTYPE", "-n", f"/dev/{device}"])
-        if output:
-            pttypes = [line.strip().lower() for line in output.split('\n') if line.strip()]
-            if pttypes:
-                pttype = pttypes[0]
-                if pttype == "gpt":
-                    return "GPT"
-                if pttype in ("dos", "msdos", "mbr"):
-                    return "MBR"
-                return pttype.upper()
-        return "Aucune"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return "Inconnue"
-
-
 def get_disk_label(device: str) -> str:
     """
     Get the label of a disk device using lsblk.
@@ -75,72 +41,20 @@ def get_disk_label(device: str) -> str:
         return "Unknown"
 
 
-def list_disks() -> str:
-    """
-    Get a raw string output of available disks using lsblk command.
-    Returns the output of the lsblk command or an empty string if no disks found.
-    """
-    try:
-        output = run_command(["lsblk", "-d", "-o", "NAME,SIZE,TYPE,MODEL", "-n"])
-        if output:
-            return output
-        else:
-            output = run_command(["lsblk", "-d", "-o", "NAME", "-n"])
-            if output:
-                logging.info(output)
-                return output
-            else:
-                logging.info("No disks detected. Ensure the program is run with appropriate permissions.")
-                return ""
-    except FileNotFoundError:
-        logging.error("Error: `lsblk` command not found. Install `util-linux` package.")
-        sys.exit(2)
-    except subprocess.CalledProcessError:
-        logging.error("Error: Failed to retrieve disk information.")
-        sys.exit(1)
-    except KeyboardInterrupt:
-        logging.error("Disk listing interrupted by user (Ctrl+C)")
-        print("\nDisk listing interrupted by user (Ctrl+C)")
-        sys.exit(130)
-
-
 def get_disk_list() -> list[dict]:
     """
     Get list of available disks as structured data.
     Returns a list of dictionaries with disk information.
     Each dictionary contains: 'device', 'size', 'model', 'label',
-    'filesystem' and 'partition_table'.
+    'filesystem' and 'partition_table', plus 'rotational', 'size_bytes'
+    and 'transport'.
+    The whole inventory comes from a single lsblk call (see inventory.py),
+    reused until a device changes.
     """
     try:
-        output = list_disks()
-
-        if not output:
+        disks = [record.as_dict() for record in get_disk_records()]
+        if not disks:
             logging.info("No disks found.")
-            return []
-
-        disks = []
-        for line in output.strip().split('\n'):
-            if not line.strip():
-                continue
-
-            parts = line.strip().split(maxsplit=3)
-            device = parts[0]
-
-            if len(parts) >= 2:
-                size = parts[1]
-                model = parts[3] if len(parts) > 3 else "Unknown"
-                label = get_disk_label(device)
-                filesystem = get_disk_filesystem(device)
-                partition_table = get_disk_partition_table(device)
-
-                disks.append({
-                    "device": f"/dev/{device}",
-                    "size": size,
-                    "model": model,
-                    "label": label,
-                    "filesystem": filesystem,
-                    "partition_table": partition_table,
-                })
         return disks
     except FileNotFoundError as e:
         logging.error(f"Error: Command not found: {str(e)}")
@@ -188,7 +102,8 @@ def choose_filesystem() -> str:
 
 def get_physical_drives_for_logical_volumes(active_devices: list) -> set:
     """
-    Map logical volumes (LVM, etc.) to their underlying physical drives.
+    Map logical volumes (LVM, dm-crypt, md RAID, nested stacks) to their underlying physical drives.
+    Resolved through the sysfs holders/slaves graph (see blockgraph.py), without subprocesses.
     
     Args:
         active_devices: List of active device paths (e.g., ['/dev/mapper/rocket--vg-root'])
@@ -200,54 +115,17 @@ def get_physical_drives_for_logical_volumes(active_devices: list) -> set:
         return set()
 
     physical_drives = set()
+    graph = get_block_graph()
 
-    try:
-        disk_list = get_disk_list()
-        physical_device_names = [disk['device'].replace('/dev/', '') for disk in disk_list]
-
-        for physical_device in physical_device_names:
-            try:
-                output = run_command([
-                    "lsblk",
-                    f"/dev/{physical_device}",
-                    "-o", "NAME",
-                    "-l",
-                    "-n"
-                ])
-
-                device_tree = []
-                for line in output.strip().split('\n'):
-                    if line.strip():
-                        device_name = line.strip()
-                        device_tree.append(f"/dev/{device_name}")
-                        device_tree.append(device_name)
-
-                for active_device in active_devices:
-                    active_variants = [
-                        active_device,
-                        active_device.replace('/dev/', ''),
-                        active_device.replace('/dev/mapper/', '')
-                    ]
-
-                    for variant in active_variants:
-                        if variant in device_tree:
-                            physical_drives.add(physical_device)
-                            logging.info(f"Found active device '{active_device}' on physical drive '{physical_device}'")
-                            break
-
-                    if physical_device in physical_drives:
-                        break
-
-            except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                logging.error(f"Could not query device tree for {physical_device}: {str(e)}")
-                continue
-
-    except (AttributeError, TypeError) as e:
-        logging.error(f"Error processing device data structures: {str(e)}")
-    except MemoryError:
-        logging.error("Insufficient memory to process logical volume mapping")
-    except OSError as e:
-        logging.error(f"OS error during logical volume mapping: {str(e)}")
+    for active_device in active_devices:
+        try:
+            drives = graph.physical_disks(active_device)
+        except (AttributeError, TypeError) as e:
+            logging.error(f"Error processing device data structures: {str(e)}")
+            continue
+        for physical_device in sorted(drives - physical_drives):
+            logging.info(f"Found active device '{active_device}' on physical drive '{physical_device}'")
+        physical_drives |= drives
 
     return physical_drives
 